@@ -0,0 +1,91 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Encoding and decoding time of the installed JSON backends.
+
+    python benchmarks/json_codec.py [repeat]
+
+The payloads are a job creation body, a job with its embedded resources
+and a page of 100 of those jobs, as returned by job-list.
+"""
+
+import sys
+import timeit
+import uuid
+
+from dciclient.v1.api import codec
+
+
+def _job(i):
+    team = {"id": str(uuid.uuid4()), "name": "team", "state": "active"}
+    return {
+        "id": str(uuid.uuid4()),
+        "created_at": "2026-01-01T00:00:00.000000",
+        "updated_at": "2026-01-01T00:00:00.000000",
+        "etag": uuid.uuid4().hex,
+        "name": "job-%s" % i,
+        "comment": u"ok ✓",
+        "status": "success",
+        "state": "active",
+        "duration": 3600 + i,
+        "tags": ["daily", "ocp-4.%s" % (i % 10)],
+        "data": {"config": {"key_%s" % k: [k, str(k)] for k in range(10)}},
+        "team": team,
+        "topic": {"id": str(uuid.uuid4()), "name": "OCP-4.14", "state": "active"},
+        "remoteci": {"id": str(uuid.uuid4()), "name": "lab", "team": team},
+        "components": [
+            {"id": str(uuid.uuid4()), "name": "c%s" % c, "type": "rpm", "tags": []}
+            for c in range(5)
+        ],
+    }
+
+
+PAYLOADS = {
+    "create": {"topic_id": str(uuid.uuid4()), "comment": "", "components": []},
+    "job": {"job": _job(0)},
+    "list": {"_meta": {"count": 100}, "jobs": [_job(i) for i in range(100)]},
+}
+
+
+def main(repeat=200):
+    backends = []
+    for name in codec.BACKENDS:
+        try:
+            codec.set_backend(name)
+            backends.append(name)
+        except ImportError:
+            print("%s: not installed" % name)
+    for payload_name, payload in sorted(PAYLOADS.items()):
+        for name in backends:
+            codec.set_backend(name)
+            text = codec.dumps(payload).encode("utf-8")
+            dumps = min(timeit.repeat(lambda: codec.dumps(payload), number=repeat))
+            loads = min(timeit.repeat(lambda: codec.loads(text), number=repeat))
+            print(
+                "%-6s %-6s %7d bytes  dumps %8.1f us  loads %8.1f us"
+                % (
+                    payload_name,
+                    name,
+                    len(text),
+                    dumps * 1e6 / repeat,
+                    loads * 1e6 / repeat,
+                )
+            )
+    codec.set_backend()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
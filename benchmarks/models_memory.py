@@ -0,0 +1,99 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Memory and CPU used by decoded jobs, as plain dicts and as models.
+
+    python benchmarks/models_memory.py [count]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+
+from dciclient.v1.api import models
+
+
+def _job_payloads(count):
+    topic_id = str(uuid.uuid4())
+    remoteci_id = str(uuid.uuid4())
+    team_id = str(uuid.uuid4())
+    for i in range(count):
+        yield json.dumps(
+            {
+                "id": str(uuid.uuid4()),
+                "created_at": "2026-01-01T00:00:%02d.000000" % (i % 60),
+                "updated_at": "2026-01-01T00:00:%02d.000000" % (i % 60),
+                "etag": uuid.uuid4().hex,
+                "name": "job-%s" % i,
+                "comment": None,
+                "status": ["success", "failure", "running"][i % 3],
+                "state": "active",
+                "duration": i,
+                "topic_id": topic_id,
+                "remoteci_id": remoteci_id,
+                "team_id": team_id,
+                "product_id": None,
+                "previous_job_id": None,
+                "update_previous_job_id": None,
+                "tags": ["daily"],
+                "user_agent": "python-dciclient",
+                "client_version": "3.0.0",
+                "data": {"config": {"key_%s" % k: k for k in range(10)}},
+            }
+        )
+
+
+def measure(count, build):
+    tracemalloc.start()
+    items = [build(json.loads(p)) for p in _job_payloads(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def measure_cpu(count, build):
+    """Seconds spent decoding the payloads and building the items."""
+    payloads = list(_job_payloads(count))
+    start = time.process_time()
+    items = [build(json.loads(p)) for p in payloads]
+    duration = time.process_time() - start
+    del items
+    return duration
+
+
+def main(count=100000):
+    dicts = measure(count, lambda d: d)
+    jobs = measure(count, models.Job.from_dict)
+    dicts_cpu = measure_cpu(count, lambda d: d)
+    jobs_cpu = measure_cpu(count, models.Job.from_dict)
+    print("%d jobs" % count)
+    print("dicts:  %8.1f MiB %8.2fs" % (dicts / 1048576.0, dicts_cpu))
+    print(
+        "models: %8.1f MiB (%.0f%%) %8.2fs (%.0f%%)"
+        % (
+            jobs / 1048576.0,
+            100.0 * jobs / dicts,
+            jobs_cpu,
+            100.0 * jobs_cpu / dicts_cpu,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
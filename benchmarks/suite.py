@@ -0,0 +1,382 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Benchmarks of the client against the in-process control server.
+
+    python -m benchmarks.suite run [--output results.json] [--only iter,...]
+    python -m benchmarks.suite compare old.json new.json [--threshold 10]
+
+The control server runs in-process through the FlaskHTTPAdapter of the
+tests, with the same database setup as the tests (see tests/conftest.py).
+The benchmarks needing it are skipped when the dci package is not
+installed. compare exits with 1 when a result regressed by more than the
+threshold percentage.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+
+from dciclient import version
+from dciclient.v1 import utils
+from dciclient.v1.api import codec
+from dciclient.v1.api import context as api_context
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def _result(value, unit, higher_is_better, samples=None):
+    return {
+        "value": value,
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+        "samples": samples or [value],
+    }
+
+
+def _best_of(func, repeat):
+    """Return the shortest duration of repeat calls of func."""
+    durations = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        durations.append(time.time() - start)
+    return min(durations), durations
+
+
+@contextlib.contextmanager
+def _silenced_stdout():
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        yield
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+class Server(object):
+    """The control server app with a provisioned database."""
+
+    URL = "http://dciserver.com"
+
+    def __init__(self):
+        import dci.app
+        import dci.dci_config
+        import sqlalchemy
+        import sqlalchemy_utils.functions
+
+        from dciclient.v1.api import product
+        from dciclient.v1.api import remoteci
+        from dciclient.v1.api import team
+        from dciclient.v1.api import topic
+        from tests.conftest import Mocked_store_engine
+        from tests.shell_commands import utils as test_utils
+
+        dci.dci_config.get_store = Mocked_store_engine
+        conf = dci.dci_config.generate_conf()
+        db_uri = conf["SQLALCHEMY_DATABASE_URI"]
+        if sqlalchemy_utils.functions.database_exists(db_uri):
+            sqlalchemy_utils.functions.drop_database(db_uri)
+        sqlalchemy_utils.functions.create_database(db_uri)
+        self.db_uri = db_uri
+        engine = sqlalchemy.create_engine(db_uri)
+        dci.db.models.metadata.create_all(engine)
+        with engine.begin() as conn:
+            test_utils.provision(conn)
+        self.app = dci.app.create_app(conf)
+        self.app.testing = True
+        self.app.engine = engine
+        self.adapter = test_utils.FlaskHTTPAdapter
+
+        self.admin = self.mount(api_context.DciContext(self.URL, "admin", "admin"))
+        team_id = team.list(self.admin, where="name:user").json()["teams"][0]["id"]
+        product_id = product.list(self.admin).json()["products"][0]["id"]
+        self.topic_id = topic.create(
+            self.admin,
+            name="benchmark",
+            component_types=["type_1"],
+            product_id=product_id,
+        ).json()["topic"]["id"]
+        topic.attach_team(self.admin, self.topic_id, team_id)
+        r = remoteci.create(self.admin, name="benchmark", team_id=team_id).json()
+        self.remoteci = self.mount(
+            api_context.DciSignatureContext(
+                self.URL, r["remoteci"]["id"], r["remoteci"]["api_secret"]
+            )
+        )
+
+    def mount(self, context):
+        context.session.mount(self.URL, self.adapter(self.app.test_client()))
+        return context
+
+    def close(self):
+        import sqlalchemy_utils.functions
+
+        sqlalchemy_utils.functions.drop_database(self.db_uri)
+
+
+@benchmark
+def iter_components(server, quick):
+    """Items per second listed by base.iter, buffered and streamed."""
+    from dciclient.v1.api import base
+    from dciclient.v1.api import component
+
+    count = 200 if quick else 2000
+    for i in range(count):
+        component.create(
+            server.admin, name="c%s" % i, type="type_1", topic_id=server.topic_id
+        )
+    results = {}
+    for stream in (False, True):
+
+        def list_all():
+            items = base.iter(
+                server.admin,
+                "topics",
+                id=server.topic_id,
+                subresource="components",
+                limit=100,
+                stream=stream,
+            )
+            assert sum(1 for _ in items) == count
+
+        best, durations = _best_of(list_all, 3)
+        name = "iter_components_stream" if stream else "iter_components"
+        results[name] = _result(
+            count / best, "items/s", True, [count / d for d in durations]
+        )
+    return results
+
+
+@benchmark
+def files(server, quick):
+    """Upload and download throughput for several file sizes."""
+    from dciclient.v1.api import component
+    from dciclient.v1.api import file
+    from dciclient.v1.api import job
+
+    component.create(
+        server.admin, name="files", type="type_1", topic_id=server.topic_id
+    )
+    job_id = job.schedule(server.remoteci, server.topic_id).json()["job"]["id"]
+    sizes = [1024, 1024 ** 2] if quick else [1024, 1024 ** 2, 16 * 1024 ** 2]
+    results = {}
+    for size in sizes:
+        content = os.urandom(size)
+        ids = []
+
+        def upload():
+            r = file.create(server.remoteci, "f", content=content, job_id=job_id)
+            ids.append(r.json()["file"]["id"])
+
+        def download():
+            assert len(file.content(server.remoteci, ids[-1]).content) == size
+
+        for name, func in [("upload", upload), ("download", download)]:
+            best, durations = _best_of(func, 3)
+            results["file_%s_%s" % (name, size)] = _result(
+                size / best / 1024 ** 2,
+                "MiB/s",
+                True,
+                [size / d / 1024 ** 2 for d in durations],
+            )
+    return results
+
+
+@benchmark
+def signature(server, quick):
+    """Time to sign a request and overhead on a GET round trip."""
+    import requests
+
+    auth = api_context.DciSignatureAuth("remoteci/%s" % uuid.uuid4(), "secret")
+    body = codec.dumps({"name": "x" * 1000}).encode("utf-8")
+    count = 200 if quick else 2000
+
+    def sign():
+        for _ in range(count):
+            request = requests.Request(
+                "POST", "http://dciserver.com/api/v1/jobs", data=body
+            )
+            auth(request.prepare())
+
+    best, durations = _best_of(sign, 3)
+    results = {
+        "signature_sign": _result(
+            best / count * 1e6, "us", False, [d / count * 1e6 for d in durations]
+        )
+    }
+    if server is not None:
+        from dciclient.v1.api import topic
+
+        for name, context in [("basic", server.admin), ("signed", server.remoteci)]:
+            best, durations = _best_of(
+                lambda: topic.get(context, server.topic_id), 20
+            )
+            results["signature_get_%s" % name] = _result(
+                best * 1e3, "ms", False, [d * 1e3 for d in durations]
+            )
+    return results
+
+
+@benchmark
+def format_output(server, quick):
+    """Rendering time of a big list in each output format."""
+    count = 100 if quick else 1000
+    jobs = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": "job-%s" % i,
+            "status": "success",
+            "comment": "x" * 40,
+            "created_at": "2026-01-01T00:00:00.000000",
+            "tags": ["daily"],
+        }
+        for i in range(count)
+    ]
+    results = {}
+    for format in ["table", "csv", "json"]:
+        with _silenced_stdout():
+            best, durations = _best_of(
+                lambda: utils.format_output({"jobs": jobs}, format), 3
+            )
+        results["format_output_%s" % format] = _result(
+            best * 1e3, "ms", False, [d * 1e3 for d in durations]
+        )
+    return results
+
+
+@benchmark
+def cold_start(server, quick):
+    """Duration of dcictl --version in a new interpreter."""
+    code = (
+        "import sys; sys.argv = ['dcictl', '--version']; "
+        "from dciclient.shell import main; main()"
+    )
+
+    def run():
+        with open(os.devnull, "w") as devnull:
+            subprocess.check_call([sys.executable, "-c", code], stdout=devnull)
+
+    best, durations = _best_of(run, 3 if quick else 10)
+    return {
+        "cold_start": _result(best * 1e3, "ms", False, [d * 1e3 for d in durations])
+    }
+
+
+def run(only=None, quick=False):
+    server = None
+    try:
+        server = Server()
+    except ImportError as e:
+        sys.stderr.write("no control server, %s\n" % e)
+    results = {}
+    try:
+        for func in BENCHMARKS:
+            if only and func.__name__ not in only:
+                continue
+            if server is None and func.__name__ in ("iter_components", "files"):
+                sys.stderr.write("%s: skipped\n" % func.__name__)
+                continue
+            sys.stderr.write("%s...\n" % func.__name__)
+            results.update(func(server, quick))
+    finally:
+        if server is not None:
+            server.close()
+    return {
+        "meta": {
+            "version": version.__version__,
+            "python": platform.python_version(),
+            "json_backend": codec.backend,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(old, new, threshold=10.0):
+    """Return the comparison lines and whether a result regressed."""
+    lines = []
+    regressed = False
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        if name not in old["results"] or name not in new["results"]:
+            lines.append("%-32s only in one run" % name)
+            continue
+        before = old["results"][name]
+        after = new["results"][name]
+        change = 100.0 * (after["value"] - before["value"]) / before["value"]
+        worse = -change if after["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        lines.append(
+            "%-32s %12.3f -> %12.3f %-7s %+7.1f%%%s"
+            % (name, before["value"], after["value"], after["unit"], change, flag)
+        )
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    subparsers = parser.add_subparsers(dest="command")
+    p = subparsers.add_parser("run")
+    p.add_argument("--output", help="JSON results file, stdout by default")
+    p.add_argument("--only", help="Comma separated list of benchmarks")
+    p.add_argument("--quick", action="store_true", help="Smaller data sets")
+    p = subparsers.add_parser("compare")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        only = args.only.split(",") if args.only else None
+        results = json.dumps(run(only, args.quick), indent=2, sort_keys=True)
+        if args.output:
+            with io.open(args.output, "w") as f:
+                f.write(u"%s\n" % results)
+        else:
+            print(results)
+    elif args.command == "compare":
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        lines, regressed = compare(old, new, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
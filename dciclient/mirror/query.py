@@ -0,0 +1,227 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Local evaluation of the where and sort arguments of the list commands.
+
+A where is a comma separated list of field:value criteria, all of them must
+match:
+- field:value, the field is equal to value
+- field:!value, the field is different from value
+- field:val*, the field matches the pattern, * matches any string
+- field:null and field:!null, the field is (not) null
+
+Fields of embedded resources are reached with dots, e.g. topic.name:foo.
+A sort is a comma separated list of fields, prefixed by - for a decreasing
+order.
+"""
+
+import json
+import re
+
+FIELD_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+
+
+def _check_field(field):
+    if not FIELD_RE.match(field):
+        raise ValueError("invalid field name: %s" % field)
+    return field
+
+
+def parse_where(where):
+    """Return the (field, operator, value) tuples of a where."""
+    conditions = []
+    for criteria in (where or "").split(","):
+        if not criteria:
+            continue
+        if ":" not in criteria:
+            raise ValueError("invalid where criteria: %s" % criteria)
+        field, value = criteria.split(":", 1)
+        _check_field(field)
+        negated = value.startswith("!")
+        if negated:
+            value = value[1:]
+        if value == "null":
+            conditions.append((field, "notnull" if negated else "null", None))
+        elif "*" in value and not negated:
+            conditions.append((field, "like", value))
+        else:
+            conditions.append((field, "ne" if negated else "eq", value))
+    return conditions
+
+
+def parse_sort(sort):
+    """Return the (field, descending) tuples of a sort."""
+    return [
+        (_check_field(f.lstrip("-")), f.startswith("-"))
+        for f in (sort or "").split(",")
+        if f
+    ]
+
+
+def text(value):
+    """Represent a resource value the way it is written in a where."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        # the way SQLite json_extract() returns them
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return "%s" % value
+
+
+def get_field(item, field):
+    for key in field.split("."):
+        if not isinstance(item, dict):
+            return None
+        item = item.get(key)
+    return item
+
+
+def _pattern(value):
+    return re.compile(
+        "^%s$" % ".*".join(re.escape(p) for p in value.split("*")), re.IGNORECASE
+    )
+
+
+def matches(item, conditions):
+    for field, operator, value in conditions:
+        v = get_field(item, field)
+        if operator == "null":
+            ok = v is None
+        elif operator == "notnull":
+            ok = v is not None
+        elif operator == "like":
+            ok = v is not None and _pattern(value).match(text(v)) is not None
+        elif operator == "eq":
+            ok = text(v) == value
+        else:
+            ok = text(v) != value
+        if not ok:
+            return False
+    return True
+
+
+def sort_items(items, sort):
+    items = list(items)
+    # null values come first in increasing order, like in SQLite
+    for field, descending in reversed(parse_sort(sort)):
+        items.sort(
+            key=lambda i: (get_field(i, field) is not None, get_field(i, field)),
+            reverse=descending,
+        )
+    return items
+
+
+def to_sql(conditions, columns):
+    """Compile conditions into a SQL clause and its parameters.
+
+    Fields that are not in columns are read from the JSON body column, they
+    are compared as text(), like matches() does.
+    """
+    clauses = []
+    params = []
+    for field, operator, value in conditions:
+        if operator in ("null", "notnull"):
+            expression, expression_params = sql_field(field, columns)
+        else:
+            expression, expression_params = sql_text(field, columns)
+        params += expression_params
+        if operator == "null":
+            clauses.append("%s IS NULL" % expression)
+        elif operator == "notnull":
+            clauses.append("%s IS NOT NULL" % expression)
+        elif operator == "like":
+            clauses.append("%s LIKE ? ESCAPE '\\'" % expression)
+            params.append(sql_like(value))
+        elif operator == "eq":
+            clauses.append("%s = ?" % expression)
+            params.append(value)
+        elif field in columns:
+            clauses.append("(%s IS NULL OR %s != ?)" % (expression, expression))
+            params.append(value)
+        else:
+            clauses.append("%s != ?" % expression)
+            params.append(value)
+    return " AND ".join(clauses), params
+
+
+def sql_like(value):
+    """Return the LIKE pattern of a where value, * being the only wildcard."""
+    for c in "\\%_":
+        value = value.replace(c, "\\" + c)
+    return value.replace("*", "%")
+
+
+def sql_field(field, columns):
+    if field in columns:
+        return field, []
+    return "json_extract(body, ?)", ["$.%s" % field]
+
+
+def sql_text(field, columns):
+    """Like sql_field() but the JSON values are converted with text().
+
+    The columns hold text values already, they are left as is to keep
+    their indexes usable.
+    """
+    if field in columns:
+        return field, []
+    path = "$.%s" % field
+    return (
+        "COALESCE(CASE json_type(body, ?) WHEN 'true' THEN 'true' "
+        "WHEN 'false' THEN 'false' ELSE CAST(json_extract(body, ?) AS TEXT) END, "
+        "'null')",
+        [path, path],
+    )
+
+
+class MemoryStore(object):
+    """In-memory set of resources with hash indexes on some fields."""
+
+    def __init__(self, items=(), indexes=("id",)):
+        self.items = {}
+        self.indexes = dict((field, {}) for field in indexes)
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        self.remove(item["id"])
+        self.items[item["id"]] = item
+        for field, index in self.indexes.items():
+            index.setdefault(text(get_field(item, field)), set()).add(item["id"])
+
+    def remove(self, id):
+        item = self.items.pop(id, None)
+        if item is None:
+            return
+        for field, index in self.indexes.items():
+            index.get(text(get_field(item, field)), set()).discard(id)
+
+    def query(self, where=None, sort=None, limit=None, offset=0):
+        conditions = parse_where(where)
+        candidates = None
+        for field, operator, value in conditions:
+            if operator == "eq" and field in self.indexes:
+                ids = self.indexes[field].get(value, set())
+                candidates = ids if candidates is None else candidates & ids
+        if candidates is None:
+            candidates = self.items.keys()
+        items = [self.items[i] for i in candidates]
+        items = sort_items((i for i in items if matches(i, conditions)), sort)
+        offset = int(offset or 0)
+        end = None if limit is None else offset + int(limit)
+        return items[offset:end]
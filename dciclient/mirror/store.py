@@ -0,0 +1,162 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import sqlite3
+
+from dciclient.mirror import query
+from dciclient.v1.api import base
+from dciclient.v1.api import codec
+
+# the columns extracted from the resources to be filtered on, they are
+# indexed, the whole resource is stored as JSON in the body column
+RESOURCES = {
+    "jobs": ["topic_id", "remoteci_id", "team_id", "product_id", "status", "state"],
+    "components": ["topic_id", "type", "name", "state"],
+    "topics": ["product_id", "name", "state"],
+    "remotecis": ["team_id", "name", "state"],
+}
+COMMON_COLUMNS = ["id", "created_at", "updated_at"]
+SYNC_PAGE_SIZE = 100
+
+
+def default_path():
+    return os.environ.get(
+        "DCI_MIRROR_DB",
+        os.path.join(os.environ.get("HOME", "."), ".cache", "dci_mirror.db"),
+    )
+
+
+class Mirror(object):
+    """Local SQLite copy of some control-server resources."""
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.connection = sqlite3.connect(self.path)
+        self._create_schema()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def columns(resource):
+        return COMMON_COLUMNS + RESOURCES[resource]
+
+    def _create_schema(self):
+        with self.connection:
+            for resource, columns in RESOURCES.items():
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS %s (id TEXT PRIMARY KEY, %s, "
+                    "body TEXT NOT NULL)"
+                    % (resource, ", ".join(c for c in self.columns(resource)[1:]))
+                )
+                for column in ["created_at", "updated_at"] + columns:
+                    self.connection.execute(
+                        "CREATE INDEX IF NOT EXISTS %s_%s_idx ON %s (%s)"
+                        % (resource, column, resource, column)
+                    )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks "
+                "(resource TEXT PRIMARY KEY, updated_at TEXT)"
+            )
+
+    def watermark(self, resource):
+        row = self.connection.execute(
+            "SELECT updated_at FROM watermarks WHERE resource = ?", (resource,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _upsert(self, resource, items):
+        columns = self.columns(resource)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO %s (%s, body) VALUES (%s)"
+            % (resource, ", ".join(columns), ", ".join("?" * (len(columns) + 1))),
+            [[i.get(c) for c in columns] + [codec.dumps(i)] for i in items],
+        )
+
+    def sync(self, context, resource, full=False, **kwargs):
+        """Fetch the resources updated since the last sync.
+
+        The resources are listed by decreasing updated_at and the listing
+        stops at the watermark of the previous sync. Deleted resources are
+        only dropped by a full sync. Returns the number of stored resources.
+        """
+        if resource not in RESOURCES:
+            raise ValueError("%s can't be mirrored" % resource)
+        with self.connection:
+            if full:
+                self.connection.execute("DELETE FROM %s" % resource)
+                self.connection.execute(
+                    "DELETE FROM watermarks WHERE resource = ?", (resource,)
+                )
+            watermark = self.watermark(resource)
+            newest = watermark
+            count = 0
+            page = []
+            items = base.iter(
+                context, resource, sort="-updated_at", limit=SYNC_PAGE_SIZE, **kwargs
+            )
+            for item in items:
+                if watermark and item["updated_at"] < watermark:
+                    break
+                newest = max(newest or item["updated_at"], item["updated_at"])
+                page.append(item)
+                if len(page) == SYNC_PAGE_SIZE:
+                    self._upsert(resource, page)
+                    count += len(page)
+                    page = []
+            self._upsert(resource, page)
+            count += len(page)
+            if newest:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO watermarks VALUES (?, ?)",
+                    (resource, newest),
+                )
+        return count
+
+    def _where(self, resource, where):
+        if resource not in RESOURCES:
+            raise ValueError("%s is not mirrored" % resource)
+        conditions = query.parse_where(where)
+        clause, params = query.to_sql(conditions, self.columns(resource))
+        return (" WHERE " + clause if clause else ""), params
+
+    def query(self, resource, where=None, sort="-created_at", limit=None, offset=0):
+        """Return the mirrored resources matching where, see query.py."""
+        sql_where, params = self._where(resource, where)
+        order = []
+        for field, descending in query.parse_sort(sort):
+            expression, expression_params = query.sql_field(
+                field, self.columns(resource)
+            )
+            order.append("%s %s" % (expression, "DESC" if descending else "ASC"))
+            params += expression_params
+
+        sql = "SELECT body FROM %s%s" % (resource, sql_where)
+        if order:
+            sql += " ORDER BY " + ", ".join(order)
+        sql += " LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else int(limit), int(offset or 0)]
+        rows = self.connection.execute(sql, params).fetchall()
+        return [codec.loads(r[0]) for r in rows]
+
+    def count(self, resource, where=None):
+        sql_where, params = self._where(resource, where)
+        sql = "SELECT COUNT(*) FROM %s%s" % (resource, sql_where)
+        return self.connection.execute(sql, params).fetchone()[0]
@@ -13,16 +13,34 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import time
+
+_START = time.time()
+
+import cProfile
 import os
 import sys
 from dciclient.v1.shell_commands.cli import parse_arguments
 from dciclient.v1.api import context as dci_context
+from dciclient.v1.api import metrics as dci_metrics
+from dciclient.v1.shell_commands.runner import offline_commands
 from dciclient.v1.shell_commands.runner import run
 from dciclient.printer import print_response
+from dciclient.timing import Timing
 
+_IMPORTED = time.time()
 
-def main():
-    args = parse_arguments(sys.argv[1:], os.environ)
+
+def _option_value(argv, option):
+    for i, arg in enumerate(argv):
+        if arg == option and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith(option + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _build_context(args):
     dci_cs_url = args.dci_cs_url
     dci_login = args.dci_login
     dci_password = args.dci_password
@@ -55,8 +73,50 @@ def main():
             dci_client_id=dci_client_id,
             dci_api_secret=dci_api_secret,
         )
-    if not context:
+    return context
+
+
+def main():
+    # parsing the arguments would be too late to profile the whole command,
+    # the imports of this module are already done and reported by --timing
+    profile_path = _option_value(sys.argv[1:], "--profile")
+    if profile_path is None:
+        return _main()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return _main()
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
+
+
+def _main():
+    timing = Timing(_START)
+    timing.add("imports", _IMPORTED - _START)
+    with timing.phase("argument parsing"):
+        args = parse_arguments(sys.argv[1:], os.environ)
+    with timing.phase("context building"):
+        context = _build_context(args)
+    offline = args.command in offline_commands or getattr(args, "offline", False)
+    if not context and not offline:
         print("No credentials provided.")
         sys.exit(1)
-    response = run(context, args)
-    print_response(response, args.format, args.verbose)
+    metrics = None
+    if context:
+        context.instrumentation.add_post_request_hook(timing.observe_request)
+        if args.metrics_file:
+            metrics = dci_metrics.Metrics().attach(context)
+    try:
+        with timing.phase("command"):
+            response = run(context, args)
+        with timing.phase("output rendering"):
+            print_response(response, args.format, args.verbose)
+    finally:
+        if metrics:
+            metrics.write_textfile(args.metrics_file)
+        if args.timing:
+            if context:
+                timing.decode_time = context.instrumentation.decode_time
+                timing.decoded_bytes = context.instrumentation.decoded_bytes
+            sys.stderr.write(timing.report() + "\n")
@@ -0,0 +1,58 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import contextlib
+import time
+
+
+class Timing(object):
+    """Durations of the phases of a dcictl invocation, see dcictl --timing."""
+
+    def __init__(self, start=None):
+        self.start = start or time.time()
+        self.phases = []
+        self.requests = 0
+        self.http_time = 0.0
+        self.decode_time = 0.0
+        self.decoded_bytes = 0
+
+    def add(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, time.time() - start)
+
+    def observe_request(self, event):
+        """Post request hook, see instrumentation.py"""
+        self.requests += 1
+        self.http_time += event["latency"]
+
+    def report(self):
+        lines = ["timing:"]
+        for name, seconds in self.phases + [("total", time.time() - self.start)]:
+            lines.append("  %-18s %8.3fs" % (name, seconds))
+        lines += [
+            "including:",
+            "  %-18s %8.3fs  %d request(s)"
+            % ("http requests", self.http_time, self.requests),
+            "  %-18s %8.3fs  %d byte(s)"
+            % ("json decoding", self.decode_time, self.decoded_bytes),
+        ]
+        return "\n".join(lines)
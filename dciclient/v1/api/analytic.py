@@ -16,8 +16,6 @@
 
 from dciclient.v1 import utils
 
-from dciclient.v1.api import base
-
 
 RESOURCE = "analytics"
 
@@ -25,27 +23,25 @@ RESOURCE = "analytics"
 def create(context, job_id, name, type, url, data):
     data = utils.sanitize_kwargs(name=name, type=type, url=url, data=data)
     uri = "%s/jobs/%s/%s" % (context.dci_cs_api, job_id, RESOURCE)
-    return context.session.post(uri, timeout=base.HTTP_TIMEOUT, json=data)
+    return context.session.post(uri, json=data)
 
 
 def get(context, id, job_id):
     uri = "%s/jobs/%s/%s/%s" % (context.dci_cs_api, job_id, RESOURCE, id)
-    return context.session.get(uri, timeout=base.HTTP_TIMEOUT)
+    return context.session.get(uri)
 
 
 def list(context, job_id):
     uri = "%s/jobs/%s/%s" % (context.dci_cs_api, job_id, RESOURCE)
-    return context.session.get(uri, timeout=base.HTTP_TIMEOUT)
+    return context.session.get(uri)
 
 
 def update(context, id, job_id, etag, name, type, url, data):
     put_data = utils.sanitize_kwargs(name=name, type=type, url=url, data=data)
     uri = "%s/jobs/%s/%s/%s" % (context.dci_cs_api, job_id, RESOURCE, id)
-    return context.session.put(
-        uri, timeout=base.HTTP_TIMEOUT, json=put_data, headers={"If-match": etag}
-    )
+    return context.session.put(uri, json=put_data, headers={"If-match": etag})
 
 
 def delete(context, id, job_id):
     uri = "%s/jobs/%s/%s/%s" % (context.dci_cs_api, job_id, RESOURCE, id)
-    return context.session.delete(uri, timeout=base.HTTP_TIMEOUT)
+    return context.session.delete(uri)
@@ -13,17 +13,54 @@
 # under the License.
 
 from dciclient.v1 import utils
+from dciclient.v1.api import jsonstream
+from dciclient.v1.api import timeouts
 
 import os
 
-HTTP_TIMEOUT = 600
+# the requests get their timeouts from context.session.timeouts, this is
+# kept for the callers passing it explicitly
+HTTP_TIMEOUT = timeouts.READ_TIMEOUT
+
+
+def _pop_fields(context, data):
+    """Extract the fields projection from the request parameters.
+
+    The projection is forwarded to the server only when the context says it
+    supports it, it is always applied client side when decoding.
+    """
+    fields = utils.parse_fields(data.pop("fields", None))
+    if fields and getattr(context, "server_side_projection", False):
+        data["fields"] = ",".join(fields)
+    return fields
+
+
+def _project(r, fields):
+    """Make the response .json() return only the requested fields."""
+    if not fields:
+        return r
+    decode = r.json
+
+    def json(**kwargs):
+        return utils.project(decode(**kwargs), fields)
+
+    r.json = json
+    return r
+
+
+def error_message(r):
+    """Return the message of an error response."""
+    try:
+        return r.json()["message"]
+    except (ValueError, KeyError, TypeError):
+        return "%s %s" % (r.status_code, r.reason)
 
 
 def create(context, resource, **kwargs):
     """Create a resource"""
     data = utils.sanitize_kwargs(**kwargs)
     uri = "%s/%s" % (context.dci_cs_api, resource)
-    r = context.session.post(uri, timeout=HTTP_TIMEOUT, json=data)
+    r = context.session.post(uri, json=data)
     return r
 
 
@@ -32,20 +69,38 @@ def list(context, resource, **kwargs):
     data = utils.sanitize_kwargs(**kwargs)
     id = data.pop("id", None)
     subresource = data.pop("subresource", None)
+    fields = _pop_fields(context, data)
 
     if subresource:
         uri = "%s/%s/%s/%s" % (context.dci_cs_api, resource, id, subresource)
     else:
         uri = "%s/%s" % (context.dci_cs_api, resource)
 
-    return context.session.get(uri, timeout=HTTP_TIMEOUT, params=data)
+    r = context.session.get(uri, params=data)
+    return _project(r, fields)
+
+
+def _page_items(context, uri, resource, params, stream):
+    if not stream:
+        r = context.session.get(uri, params=params)
+        return r.json()[resource]
+    r = context.session.get(uri, params=params, stream=True)
+    if r.status_code != 200:
+        return r.json()[resource]
+    return jsonstream.iter_response_items(r, resource)
 
 
 def iter(context, resource, **kwargs):
-    """List all resources"""
+    """List all resources
+
+    With stream=True, the items of each page are decoded and yielded while
+    the page is being downloaded, see jsonstream.py.
+    """
     data = utils.sanitize_kwargs(**kwargs)
     id = data.pop("id", None)
     subresource = data.pop("subresource", None)
+    stream = data.pop("stream", False)
+    fields = _pop_fields(context, data)
     data["limit"] = data.get("limit", 20)
 
     if subresource:
@@ -56,20 +111,27 @@ def iter(context, resource, **kwargs):
 
     data["offset"] = 0
     while True:
-        j = context.session.get(uri, timeout=HTTP_TIMEOUT, params=data).json()
-        if len(j[resource]):
-            for i in j[resource]:
-                yield i
-        else:
+        count = 0
+        for i in _page_items(context, uri, resource, data, stream):
+            count += 1
+            yield utils.project_item(i, fields) if fields else i
+        if not count:
             break
         data["offset"] += data["limit"]
 
 
+def iter_models(context, resource, model, **kwargs):
+    """List all resources as compact models, see models.py"""
+    for i in iter(context, resource, **kwargs):
+        yield model.from_dict(i)
+
+
 def get(context, resource, **kwargs):
     """List a specific resource"""
     uri = "%s/%s/%s" % (context.dci_cs_api, resource, kwargs.pop("id"))
-    r = context.session.get(uri, timeout=HTTP_TIMEOUT, params=kwargs)
-    return r
+    fields = _pop_fields(context, kwargs)
+    r = context.session.get(uri, params=kwargs)
+    return _project(r, fields)
 
 
 def get_data(context, resource, **kwargs):
@@ -86,7 +148,7 @@ def get_data(context, resource, **kwargs):
         url_suffix,
     )
 
-    r = context.session.get(uri, timeout=HTTP_TIMEOUT, params=kwargs)
+    r = context.session.get(uri, params=kwargs)
     return r
 
 
@@ -96,9 +158,7 @@ def update(context, resource, **kwargs):
     id = kwargs.pop("id")
     data = utils.sanitize_kwargs(**kwargs)
     uri = "%s/%s/%s" % (context.dci_cs_api, resource, id)
-    r = context.session.put(
-        uri, timeout=HTTP_TIMEOUT, headers={"If-match": etag}, json=data
-    )
+    r = context.session.put(uri, headers={"If-match": etag}, json=data)
     return r
 
 
@@ -118,7 +178,7 @@ def delete(context, resource, id, **kwargs):
     if subresource is not None and subresource_id is not None:
         uri = "%s/%s/%s" % (origin_uri, subresource, subresource_id)
 
-    r = context.session.delete(uri, timeout=HTTP_TIMEOUT, headers={"If-match": etag}, json=json)  # noqa
+    r = context.session.delete(uri, headers={"If-match": etag}, json=json)
     return r
 
 
@@ -126,14 +186,14 @@ def purge(context, resource, **kwargs):
     """Purge resource type."""
     uri = "%s/%s/purge" % (context.dci_cs_api, resource)
     if "force" in kwargs and kwargs["force"]:
-        r = context.session.post(uri, timeout=HTTP_TIMEOUT)
+        r = context.session.post(uri)
     else:
-        r = context.session.get(uri, timeout=HTTP_TIMEOUT)
+        r = context.session.get(uri)
     return r
 
 
 def download(context, uri, target):
-    r = context.session.get(uri, stream=True, timeout=HTTP_TIMEOUT)
+    r = context.session.get(uri, stream=True)
     r.raise_for_status()
     with open(target + ".part", "wb") as f:
         for chunk in r.iter_content(chunk_size=1024):
@@ -0,0 +1,161 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Concurrent updates of many resources.
+
+The etags come from a listing of the resources instead of a GET before
+each PUT. When a resource changed since the listing, the PUT fails with
+412, the resource is fetched again and the merge function is applied to
+its current version before trying again:
+
+    def deactivate(component):
+        if component["created_at"] < "2026-01-01":
+            return {"state": "inactive"}
+
+    batch.update(
+        context,
+        "components",
+        base.iter(context, "topics", id=topic_id, subresource="components"),
+        deactivate,
+    )
+"""
+
+import requests
+
+from dciclient.v1.api import base
+from dciclient.v1.api import parallel
+
+MAX_ATTEMPTS = 3
+
+
+def _changes(item, merge):
+    """Return the fields of merge(item) that differ from the item."""
+    fields = merge(item) or {}
+    return dict((k, v) for k, v in fields.items() if item.get(k) != v)
+
+
+def _fetch(context, resource, id):
+    try:
+        r = base.get(context, resource, id=id)
+    except requests.exceptions.RequestException as e:
+        return None, str(e)
+    if r.status_code != 200:
+        return None, base.error_message(r)
+    return r.json()[resource[:-1]], None
+
+
+def _update(context, resource, item, merge, max_attempts):
+    report = {"id": item["id"], "attempts": 0, "error": None}
+    while True:
+        changes = _changes(item, merge)
+        if not changes:
+            report["result"] = "unchanged"
+            return report
+        report["attempts"] += 1
+        r = base.update(context, resource, id=item["id"], etag=item["etag"], **changes)
+        if r.status_code == 200:
+            report["result"] = "updated"
+            return report
+        if r.status_code != 412 or report["attempts"] >= max_attempts:
+            report["result"], report["error"] = "failed", base.error_message(r)
+            return report
+        item, error = _fetch(context, resource, item["id"])
+        if item is None:
+            report["result"], report["error"] = "failed", error
+            return report
+
+
+def update(
+    context,
+    resource,
+    items,
+    merge,
+    workers=parallel.DEFAULT_WORKERS,
+    max_attempts=MAX_ATTEMPTS,
+):
+    """Apply merge to the items and update the resources that changed.
+
+    items are the current versions of the resources, with their id and
+    etag, e.g. a base.iter() listing. It's read entirely before the first
+    update so the updates can't shift its pages. merge is called with a
+    resource and returns the fields to update, or None, it's called again
+    with the refetched resource after a 412, up to max_attempts PUTs.
+
+    Returns a report per resource with its id, result: updated, unchanged
+    or failed, the number of PUTs done and the error.
+    """
+    items = list(items)
+
+    def _call(item):
+        try:
+            return _update(context, resource, item, merge, max_attempts)
+        except requests.exceptions.RequestException as e:
+            return {
+                "id": item["id"],
+                "result": "failed",
+                "attempts": None,
+                "error": str(e),
+            }
+
+    return list(parallel.imap(_call, items, workers=workers))
+
+
+def update_ids(
+    context,
+    resource,
+    changes,
+    items=None,
+    workers=parallel.DEFAULT_WORKERS,
+    max_attempts=MAX_ATTEMPTS,
+):
+    """Update the resources of changes, a dict of id -> fields.
+
+    The etags are taken from items, e.g. a listing of the parent resource,
+    which is read until all the resources are found. The resources missing
+    from it are fetched one by one.
+
+    Returns the reports of update(), in the order of changes.
+    """
+    found = {}
+    for item in items or []:
+        if item["id"] in changes:
+            found[item["id"]] = item
+            if len(found) == len(changes):
+                break
+
+    missing = [id for id in changes if id not in found]
+    fetched = list(
+        parallel.imap(lambda id: _fetch(context, resource, id), missing, workers)
+    )
+    errors = {}
+    for id, (item, error) in zip(missing, fetched):
+        if item is None:
+            errors[id] = error
+        else:
+            found[id] = item
+
+    reports = update(
+        context,
+        resource,
+        [found[id] for id in changes if id in found],
+        lambda item: changes[item["id"]],
+        workers=workers,
+        max_attempts=max_attempts,
+    )
+    reports = dict((r["id"], r) for r in reports)
+    for id, error in errors.items():
+        reports[id] = {"id": id, "result": "failed", "attempts": 0, "error": error}
+    return [reports[id] for id in changes]
@@ -0,0 +1,188 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""HTTP response caches used by the context session for GET requests.
+
+A cache is enabled by passing it to a context:
+
+    context = build_dci_context(cache=MemoryCache(ttl=300, max_size=512))
+
+Entries younger than `ttl` seconds are served without any request, older
+ones are revalidated with an If-None-Match conditional request. Every
+request other than a GET invalidates the whole cache.
+
+A cache provides get(key), set(key, entry) and invalidate(), the entries
+are the dicts of entry_from_response().
+"""
+
+import base64
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def _find_etag(r):
+    etag = r.headers.get("ETag")
+    if etag:
+        return etag
+    # single resource answers carry the etag in the resource itself
+    try:
+        values = [v for k, v in r.json().items() if k != "_meta"]
+    except (ValueError, AttributeError):
+        return None
+    if len(values) == 1 and isinstance(values[0], dict):
+        return values[0].get("etag")
+    return None
+
+
+def entry_from_response(r):
+    return {
+        "url": r.url,
+        "status_code": r.status_code,
+        "headers": dict(r.headers),
+        "content": r.content,
+        "encoding": r.encoding,
+        "etag": _find_etag(r),
+        "stored_at": time.time(),
+    }
+
+
+def response_from_entry(entry):
+    r = requests.models.Response()
+    r.status_code = entry["status_code"]
+    r.headers = CaseInsensitiveDict(entry["headers"])
+    r.url = entry["url"]
+    r.encoding = entry["encoding"]
+    r._content = entry["content"]
+    r._content_consumed = True
+    r.from_cache = True
+    return r
+
+
+class BaseCache(object):
+    def __init__(self, ttl=60, max_size=256):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored_at"] < self.ttl
+
+
+class MemoryCache(BaseCache):
+    """In-memory LRU cache, shareable between threads."""
+
+    def __init__(self, ttl=60, max_size=256):
+        super(MemoryCache, self).__init__(ttl, max_size)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(BaseCache):
+    """On-disk LRU cache, one file per entry, usable across processes.
+
+    The entries are stored as JSON, the content base64 encoded, and the
+    modification time of the files is used as the LRU clock.
+    """
+
+    def __init__(self, path, ttl=60, max_size=1024):
+        super(DiskCache, self).__init__(ttl, max_size)
+        self.path = path
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+    def _file(self, key):
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, digest)
+
+    def _files(self):
+        return [os.path.join(self.path, f) for f in os.listdir(self.path)]
+
+    @staticmethod
+    def _load(file_path):
+        try:
+            with open(file_path, "rb") as f:
+                entry = json.loads(f.read().decode("utf-8"))
+            entry["content"] = base64.b64decode(entry["content"])
+            return entry
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def get(self, key):
+        file_path = self._file(key)
+        entry = self._load(file_path)
+        if entry is not None:
+            try:
+                os.utime(file_path, None)
+            except OSError:
+                pass
+        return entry
+
+    def set(self, key, entry):
+        entry = dict(entry, content=base64.b64encode(entry["content"] or b""))
+        entry["content"] = entry["content"].decode("ascii")
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(entry).encode("utf-8"))
+        os.rename(tmp_path, self._file(key))
+        self._evict()
+
+    def _evict(self):
+        files = [f for f in self._files() if not f.endswith(".part")]
+        if len(files) <= self.max_size:
+            return
+        files.sort(key=lambda f: os.stat(f).st_mtime)
+        for f in files[: len(files) - self.max_size]:
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+
+    def invalidate(self):
+        for f in self._files():
+            if f.endswith(".part"):
+                continue
+            try:
+                os.remove(f)
+            except OSError:
+                pass
@@ -0,0 +1,157 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Circuit breakers of the hosts a context talks to.
+
+A breaker is closed while the host answers. It opens when at least
+failure_threshold of the requests of the last window seconds failed, with
+a connection error, a timeout or a 5xx response. A request counts once,
+with the outcome of its last retry. Then the requests to the host fail
+fast with CircuitOpenError instead of waiting for timeouts and retries.
+After reset_timeout seconds it is half-open: a few probe requests are let
+through, the breaker closes again if they succeed and opens again if they
+fail.
+"""
+
+import collections
+import threading
+import time
+
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+
+from dciclient.v1.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+STATES = (CLOSED, OPEN, HALF_OPEN)
+FAILURE_STATUSES = frozenset([500, 502, 503, 504])
+
+
+class CircuitBreaker(object):
+    def __init__(
+        self,
+        host,
+        failure_threshold=0.5,
+        minimum_requests=10,
+        window=60,
+        reset_timeout=30,
+        half_open_requests=1,
+        listener=None,
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.minimum_requests = minimum_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_requests = half_open_requests
+        self.listener = listener
+        self.state = CLOSED
+        self.opened_at = None
+        self._outcomes = collections.deque()
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        """Change the state, returns it if it changed, to be notified."""
+        if state == self.state:
+            return None
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.time()
+        self._outcomes.clear()
+        self._probes = 0
+        return state
+
+    def _notify(self, changed):
+        if changed and self.listener is not None:
+            self.listener(self.host, changed)
+
+    def before(self):
+        """Raise CircuitOpenError if a request can't be sent now."""
+        changed = None
+        with self._lock:
+            if self.state == OPEN:
+                retry_in = self.opened_at + self.reset_timeout - time.time()
+                if retry_in > 0:
+                    raise CircuitOpenError(
+                        "circuit open for %s, retry in %.0fs" % (self.host, retry_in)
+                    )
+                changed = self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_requests:
+                    raise CircuitOpenError(
+                        "circuit half-open for %s, waiting for probes" % self.host
+                    )
+                self._probes += 1
+        self._notify(changed)
+
+    def is_open(self):
+        with self._lock:
+            return self.state == OPEN
+
+    def cancel(self):
+        """Forget a request let through by before(), without outcome."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, failed):
+        """Record the outcome of a request let through by before()."""
+        changed = None
+        now = time.time()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                changed = self._set_state(OPEN if failed else CLOSED)
+            elif self.state == CLOSED:
+                self._outcomes.append((now, failed))
+                while self._outcomes and self._outcomes[0][0] < now - self.window:
+                    self._outcomes.popleft()
+                failures = sum(1 for _, f in self._outcomes if f)
+                count = len(self._outcomes)
+                if (
+                    count >= self.minimum_requests
+                    and failures >= self.failure_threshold * count
+                ):
+                    changed = self._set_state(OPEN)
+        self._notify(changed)
+
+
+class CircuitBreakers(object):
+    """The circuit breaker of each host, created on first use."""
+
+    def __init__(self, listener=None, **settings):
+        self.listener = listener
+        self.settings = settings
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = self.breakers[host] = CircuitBreaker(
+                    host, listener=self.listener, **self.settings
+                )
+            return breaker
+
+    def states(self):
+        with self._lock:
+            return dict((host, b.state) for host, b in self.breakers.items())
@@ -0,0 +1,117 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""JSON encoding and decoding of the request and response bodies.
+
+The first installed backend of BACKENDS is used, the stdlib json module
+being always available. DCI_JSON_BACKEND=orjson|ujson|json forces one.
+Indented output, meant to be read by humans, and the values a fast backend
+can't encode are always encoded by the stdlib.
+"""
+
+import json
+import os
+
+BACKENDS = ["orjson", "ujson", "json"]
+
+backend = None
+_loads = None
+_dumps = None
+
+
+def _json_loads(s):
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode("utf-8")
+    return json.loads(s)
+
+
+def _json_dumps(obj, indent=None, sort_keys=False):
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+def _orjson():
+    import orjson
+
+    def dumps(obj, indent=None, sort_keys=False):
+        if indent is not None:
+            return _json_dumps(obj, indent, sort_keys)
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            return _json_dumps(obj, indent, sort_keys)
+
+    return orjson.loads, dumps
+
+
+def _ujson():
+    import ujson
+
+    def dumps(obj, indent=None, sort_keys=False):
+        if indent is not None:
+            return _json_dumps(obj, indent, sort_keys)
+        try:
+            return ujson.dumps(
+                obj,
+                sort_keys=sort_keys,
+                ensure_ascii=False,
+                escape_forward_slashes=False,
+            )
+        except (TypeError, OverflowError):
+            return _json_dumps(obj, indent, sort_keys)
+
+    return ujson.loads, dumps
+
+
+def _load_backend(name):
+    if name == "orjson":
+        return _orjson()
+    if name == "ujson":
+        return _ujson()
+    if name == "json":
+        return _json_loads, _json_dumps
+    raise ValueError("unknown JSON backend: %s" % name)
+
+
+def set_backend(name=None):
+    """Select the JSON backend, by default the first installed one."""
+    global backend, _loads, _dumps
+    for candidate in [name] if name else BACKENDS:
+        try:
+            _loads, _dumps = _load_backend(candidate)
+        except ImportError:
+            if name:
+                raise
+            continue
+        backend = candidate
+        return backend
+
+
+def loads(s):
+    """Decode a JSON document, s can be text or UTF-8 bytes."""
+    if not isinstance(s, (type(u""), bytes, bytearray)):
+        raise TypeError("can't decode JSON from %s" % type(s).__name__)
+    return _loads(s)
+
+
+def dumps(obj, indent=None, sort_keys=False):
+    """Encode obj as a JSON text."""
+    return _dumps(obj, indent, sort_keys)
+
+
+set_backend(os.environ.get("DCI_JSON_BACKEND"))
@@ -15,6 +15,7 @@
 # under the License.
 
 from dciclient.v1.api import base
+from dciclient.v1.api import parallel
 from dciclient.v1.api.tag import add_tag_to_resource, delete_tag_from_resource
 
 RESOURCE = "components"
@@ -47,6 +48,68 @@ def create(
     )
 
 
+def create_many(context, topic_id, components, workers=parallel.DEFAULT_WORKERS):
+    """Create or update the components of a topic, concurrently.
+
+    Each component is a dict of the create() arguments. The existing
+    components of the topic are listed once and matched on their name and
+    type, they are only updated when one of the given fields differs, with
+    the etag of the listing.
+
+    Returns a report per component, in order, with its name, type, id and
+    result: created, updated, unchanged or failed along with the error, a
+    component is reported failed on any exception.
+    """
+    existing = {}
+    for type in sorted(set(c["type"] for c in components)):
+        for c in base.iter(
+            context,
+            "topics",
+            id=topic_id,
+            subresource="components",
+            where="type:%s" % type,
+            limit=100,
+        ):
+            existing[(c["name"], c["type"])] = c
+
+    def _send(c):
+        report = {"name": c["name"], "type": c["type"], "id": None, "error": None}
+        current = existing.get((c["name"], c["type"]))
+        if current is None:
+            r = base.create(context, RESOURCE, topic_id=topic_id, **c)
+            report["result"], expected = "created", 201
+        else:
+            report["id"] = current["id"]
+            changes = dict((k, v) for k, v in c.items() if current.get(k) != v)
+            if not changes:
+                report["result"] = "unchanged"
+                return report
+            r = base.update(
+                context, RESOURCE, id=current["id"], etag=current["etag"], **changes
+            )
+            report["result"], expected = "updated", 200
+        if r.status_code != expected:
+            report["result"], report["error"] = "failed", base.error_message(r)
+        else:
+            report["id"] = r.json()["component"]["id"]
+        return report
+
+    def _import(c):
+        try:
+            return _send(c)
+        except Exception as e:
+            # one bad component doesn't abort the import of the others
+            return {
+                "name": c["name"],
+                "type": c["type"],
+                "id": None,
+                "result": "failed",
+                "error": str(e),
+            }
+
+    return list(parallel.imap(_import, components, workers=workers))
+
+
 def get(context, id, **kwargs):
     return base.get(context, RESOURCE, id=id, **kwargs)
 
@@ -11,10 +11,13 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import json
+import copy
+import hashlib
 
 import os
 import os.path
+import threading
+import time
 from requests import compat
 
 try:
@@ -24,49 +27,370 @@ except ImportError:
     from urllib.parse import parse_qsl
     from urllib.parse import urlparse
 import requests
-from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
-from requests.packages.urllib3.util.retry import Retry
 
 from dciauth.request import AuthRequest
 from dciauth.signature import Signature
 from dciclient import version
+from dciclient.v1.api import cache as dci_cache
+from dciclient.v1.api import circuit
+from dciclient.v1.api import codec
+from dciclient.v1.api import identity
+from dciclient.v1.api import instrumentation as dci_instrumentation
+from dciclient.v1.api import retry as dci_retry
+from dciclient.v1.api import timeouts as dci_timeouts
+from dciclient.v1.exceptions import DeadlineExceeded
+
+
+class _InflightCall(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+def _decode_with_codec(r, instrumentation=None):
+    """Make r.json() decode the body with the JSON codec, see codec.py."""
+
+    def json(**kwargs):
+        if kwargs:
+            return requests.Response.json(r, **kwargs)
+        if instrumentation is None:
+            return codec.loads(r.content)
+        start = time.time()
+        try:
+            return codec.loads(r.content)
+        finally:
+            instrumentation.record_decode(time.time() - start, len(r.content or b""))
+
+    r.json = json
+    return r
+
+
+def _content_length(headers):
+    length = headers.get("Content-Length") if headers is not None else None
+    return int(length) if length else 0
+
+
+def _measure(event, r, error, latency, stream):
+    """Complete an instrumentation event once the response is received."""
+    request = getattr(r, "request", None)
+    elapsed = getattr(r, "elapsed", None)
+    event.update(
+        {
+            "status": getattr(r, "status_code", None),
+            "error": error,
+            "bytes_out": _content_length(getattr(request, "headers", None)),
+            "bytes_in": None,
+            "ttfb": elapsed.total_seconds() if elapsed is not None else None,
+            "latency": latency,
+            "retries": getattr(r, "retries", getattr(error, "retries", 0)),
+            "signing_time": getattr(request, "signing_time", 0.0),
+            "cached": getattr(r, "from_cache", False),
+            "coalesced": getattr(r, "coalesced", False),
+        }
+    )
+    if r is not None:
+        event["bytes_in"] = (
+            _content_length(r.headers) if stream else len(r.content or b"")
+        )
+    return event
+
+
+class DciSession(requests.Session):
+    """HTTP session shared by all the API calls of a context."""
+
+    def __init__(self):
+        super(DciSession, self).__init__()
+        self.cache = None
+        self.api_root = None
+        # identifies the authenticated resource, requests are only shared
+        # between callers using the same identity
+        self.auth_identity = None
+        # set by the context to time the requests, see instrumentation.py
+        self.instrumentation = None
+        # failed requests are retried according to it, see retry.py
+        self.retry_policy = None
+        # requests to a failing host fail fast, see circuit.py
+        self.circuit_breakers = None
+        # (connect, read) timeouts of the requests, see timeouts.py
+        self.timeouts = None
+        # concurrent identical GET requests are coalesced into a single one,
+        # coalesced_requests counts the requests saved that way
+        self.coalesce = True
+        self.coalesced_requests = 0
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def request_key(self, url, params=None):
+        url = requests.Request("GET", url, params=params).prepare().url
+        return (self.auth_identity, url)
+
+    def _resource(self, url):
+        prefix = "%s/" % self.api_root
+        if self.api_root and url.startswith(prefix):
+            return url[len(prefix):].split("?")[0].split("/")[0]
+        return None
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("json") is not None and kwargs.get("data") is None:
+            kwargs["data"] = codec.dumps(kwargs.pop("json")).encode("utf-8")
+        if self.instrumentation is None:
+            return _decode_with_codec(self._request(method, url, **kwargs))
+
+        event = {
+            "method": method.upper(),
+            "url": url,
+            "endpoint": dci_instrumentation.endpoint(url, self.api_root),
+        }
+        self.instrumentation.before(event)
+        start = time.time()
+        r = None
+        error = None
+        try:
+            r = self._request(method, url, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _measure(event, r, error, time.time() - start, kwargs.get("stream"))
+            self.instrumentation.after(event)
+        return _decode_with_codec(r, self.instrumentation)
+
+    def _request(self, method, url, **kwargs):
+        if method.upper() != "GET" or kwargs.get("stream"):
+            r = self._send(method, url, **kwargs)
+            if self.cache is not None and method.upper() != "GET":
+                # a write can change the listings of other resources too,
+                # e.g. POST /components those of /topics/<id>/components
+                self.cache.invalidate()
+            return r
+
+        key = self.request_key(url, kwargs.get("params"))
+        if not self.coalesce:
+            return self._get(key, url, **kwargs)
+
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InflightCall()
+            else:
+                self.coalesced_requests += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            r = copy.copy(call.response)
+            r.coalesced = True
+            return r
+
+        try:
+            call.response = self._get(key, url, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.response
+
+    def _send(self, method, url, **kwargs):
+        """Send a request through the circuit breaker of its host.
+
+        A single outcome is recorded per request, once the retries are over.
+        """
+        if self.circuit_breakers is None:
+            return self._send_retrying(method, url, None, **kwargs)
+
+        breaker = self.circuit_breakers.get(url)
+        breaker.before()
+        try:
+            r = self._send_retrying(method, url, breaker, **kwargs)
+        except DeadlineExceeded:
+            breaker.cancel()
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            breaker.record(failed=True)
+            raise
+        except Exception:
+            breaker.cancel()
+            raise
+        breaker.record(failed=r.status_code in circuit.FAILURE_STATUSES)
+        return r
+
+    def _send_retrying(self, method, url, breaker, **kwargs):
+        """Send a request, retrying it according to the retry policy.
+
+        The retries stop when the circuit of the host opens meanwhile.
+        """
+        send = self._send_once
+        policy = self.retry_policy
+        rewind = dci_retry.rewinder(kwargs.get("data"))
+        if policy is None or not policy.max_retries or rewind is None:
+            return send(method, url, **kwargs)
+
+        def _gives_up(delay):
+            return delay is None or not dci_timeouts.allows(delay)
+
+        start = time.time()
+        retries = 0
+        while True:
+            try:
+                r = send(method, url, **kwargs)
+            except DeadlineExceeded as e:
+                e.retries = retries
+                raise
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                delay = policy.delay(
+                    method,
+                    kwargs.get("headers"),
+                    retries + 1,
+                    time.time() - start,
+                    error=e,
+                )
+                if _gives_up(delay):
+                    e.retries = retries
+                    raise
+                last = e
+            else:
+                delay = policy.delay(
+                    method,
+                    kwargs.get("headers"),
+                    retries + 1,
+                    time.time() - start,
+                    response=r,
+                )
+                if _gives_up(delay):
+                    r.retries = retries
+                    return r
+                last = r
+            policy.sleep(delay)
+            if breaker is not None and breaker.is_open():
+                # another request opened it meanwhile, give up with the
+                # outcome of the last attempt
+                last.retries = retries
+                if isinstance(last, Exception):
+                    raise last
+                return last
+            if not isinstance(last, Exception):
+                last.close()
+            rewind()
+            retries += 1
+
+    def _send_once(self, method, url, **kwargs):
+        if self.timeouts is not None:
+            kwargs["timeout"] = self.timeouts.timeout(
+                self._resource(url), kwargs.get("timeout")
+            )
+        return super(DciSession, self).request(method, url, **kwargs)
+
+    def _get(self, key, url, **kwargs):
+        if self.cache is None:
+            return self._send("GET", url, **kwargs)
+
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.hits += 1
+            return dci_cache.response_from_entry(entry)
+
+        if entry is not None and entry["etag"]:
+            headers = dict(kwargs.get("headers") or {})
+            headers["If-None-Match"] = entry["etag"]
+            kwargs["headers"] = headers
+        r = self._send("GET", url, **kwargs)
+
+        if r.status_code == 304 and entry is not None:
+            self.cache.revalidations += 1
+            entry["stored_at"] = time.time()
+            self.cache.set(key, entry)
+            return dci_cache.response_from_entry(entry)
+        self.cache.misses += 1
+        if r.status_code == 200:
+            self.cache.set(key, dci_cache.entry_from_response(r))
+        return r
 
 
 class DciContextBase(object):
     API_VERSION = "api/v1"
 
-    def __init__(self, dci_cs_url, max_retries=0, user_agent=None):
+    def __init__(self, dci_cs_url, max_retries=0, user_agent=None, cache=None):
         self.session = self._build_http_session(user_agent, max_retries)
+        self.dci_cs_url = dci_cs_url
         self.dci_cs_api = "%s/%s" % (dci_cs_url, DciContext.API_VERSION)
+        self.session.api_root = self.dci_cs_api
+        self.session.cache = cache
+        self.instrumentation = dci_instrumentation.Instrumentation()
+        self.session.instrumentation = self.instrumentation
+        self.session.circuit_breakers = circuit.CircuitBreakers(
+            listener=self.instrumentation.circuit_changed
+        )
         self.last_job_id = None
+        # set to True when the control server knows how to handle the
+        # `fields` query parameter, see base.list()
+        self.server_side_projection = False
+        self._identity = None
+        self._identity_lock = threading.Lock()
+
+    @property
+    def identity(self):
+        """The authenticated identity, fetched once per context lifetime."""
+        with self._identity_lock:
+            if self._identity is None:
+                r = identity.get(self)
+                r.raise_for_status()
+                self._identity = r.json()["identity"]
+            return self._identity
+
+    def invalidate_identity(self):
+        """Forget the cached identity, e.g. after a team change."""
+        with self._identity_lock:
+            self._identity = None
 
     @staticmethod
     def _build_http_session(user_agent, max_retries):
-        session = requests.Session()
+        session = DciSession()
         session.headers.setdefault("Content-Type", "application/json")
         if not user_agent:
             user_agent = "python-dciclient_%s" % version.__version__
         session.headers["User-Agent"] = user_agent
         session.headers["Client-Version"] = "python-dciclient_%s" % version.__version__
-        retries = Retry(total=max_retries, backoff_factor=0.1)
-        session.mount("http://", HTTPAdapter(max_retries=retries))
-        session.mount("https://", HTTPAdapter(max_retries=retries))
+        session.retry_policy = dci_retry.RetryPolicy(max_retries=max_retries)
+        session.timeouts = dci_timeouts.TimeoutPolicy()
 
         return session
 
 
 class DciContext(DciContextBase):
-    def __init__(self, dci_cs_url, login, password, max_retries=0, user_agent=None):
+    def __init__(
+        self,
+        dci_cs_url,
+        login,
+        password,
+        max_retries=0,
+        user_agent=None,
+        cache=None,
+    ):
         super(DciContext, self).__init__(
-            dci_cs_url.rstrip("/"), max_retries, user_agent
+            dci_cs_url.rstrip("/"), max_retries, user_agent, cache
         )
         self.login = login
         self.session.auth = (login, password)
+        self.session.auth_identity = "user/%s" % login
 
 
 def build_dci_context(
-    dci_cs_url=None, dci_login=None, dci_password=None, user_agent=None, max_retries=80
+    dci_cs_url=None,
+    dci_login=None,
+    dci_password=None,
+    user_agent=None,
+    max_retries=80,
+    cache=None,
 ):
     dci_cs_url = dci_cs_url or os.environ.get("DCI_CS_URL", "")
     dci_login = dci_login or os.environ.get("DCI_LOGIN", "")
@@ -85,6 +409,7 @@ def build_dci_context(
         dci_password,
         user_agent=user_agent,
         max_retries=max_retries,
+        cache=cache,
     )
 
 
@@ -102,6 +427,7 @@ class DciSignatureAuth(AuthBase):
         return client_id.split("/")[:2]
 
     def __call__(self, r):
+        start = time.time()
         url = urlparse(r.url)
         params = dict(parse_qsl(url.query))
         payload = self.get_payload(r)
@@ -118,6 +444,7 @@ class DciSignatureAuth(AuthBase):
             secret=self.api_secret,
         )
         r.headers.update(headers)
+        r.signing_time = time.time() - start
         return r
 
     def get_payload(self, r):
@@ -126,19 +453,29 @@ class DciSignatureAuth(AuthBase):
                 body = r.body.decode("utf-8")
             else:
                 body = r.body
-            return dict(json.loads(body or "{}"))
+            return dict(codec.loads(body or "{}"))
         except TypeError:
             return {}
 
 
 class DciSignatureContext(DciContextBase):
     def __init__(
-        self, dci_cs_url, client_id, api_secret, max_retries=0, user_agent=None
+        self,
+        dci_cs_url,
+        client_id,
+        api_secret,
+        max_retries=0,
+        user_agent=None,
+        cache=None,
     ):
         super(DciSignatureContext, self).__init__(
-            dci_cs_url.rstrip("/"), max_retries, user_agent
+            dci_cs_url.rstrip("/"), max_retries, user_agent, cache
         )
         self.session.auth = DciSignatureAuth(client_id, api_secret)
+        self.session.auth_identity = "%s/%s" % (
+            self.session.auth.client_type,
+            self.session.auth.client_id,
+        )
 
 
 def build_signature_context(
@@ -147,6 +484,7 @@ def build_signature_context(
     dci_api_secret=None,
     user_agent=None,
     max_retries=80,
+    cache=None,
 ):
     dci_cs_url = dci_cs_url or os.environ.get("DCI_CS_URL", "")
     dci_client_id = dci_client_id or os.environ.get("DCI_CLIENT_ID", "")
@@ -164,15 +502,19 @@ def build_signature_context(
         dci_api_secret,
         user_agent=user_agent,
         max_retries=max_retries,
+        cache=cache,
     )
 
 
 class SsoContext(DciContextBase):
-    def __init__(self, dci_cs_url, token, max_retries=0, user_agent=None):
+    def __init__(self, dci_cs_url, token, max_retries=0, user_agent=None, cache=None):
         super(SsoContext, self).__init__(
-            dci_cs_url.rstrip("/"), max_retries, user_agent
+            dci_cs_url.rstrip("/"), max_retries, user_agent, cache
         )
         self.session.headers["Authorization"] = "Bearer %s" % token
+        self.session.auth_identity = (
+            "sso/%s" % hashlib.sha256(token.encode("utf-8")).hexdigest()
+        )
 
 
 def build_sso_context(
@@ -184,6 +526,7 @@ def build_sso_context(
     max_retries=0,
     user_agent=None,
     refresh=False,
+    cache=None,
 ):
     def _get_token_from_file(token_path):
         if os.path.exists(token_path):
@@ -227,4 +570,4 @@ def build_sso_context(
         _write_token_to_file(token_path, token)
 
     dci_cs_url = dci_cs_url or os.environ.get("DCI_CS_URL", "")
-    return SsoContext(dci_cs_url, token, max_retries, user_agent)
+    return SsoContext(dci_cs_url, token, max_retries, user_agent, cache)
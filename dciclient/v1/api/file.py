@@ -15,6 +15,7 @@
 # under the License.
 
 from dciclient.v1.api import base
+from dciclient.v1.api import models
 from dciclient.v1 import utils
 
 import io
@@ -110,6 +111,10 @@ def iter(context, **kwargs):
     return base.iter(context, RESOURCE, **kwargs)
 
 
+def iter_models(context, **kwargs):
+    return base.iter_models(context, RESOURCE, models.File, **kwargs)
+
+
 def delete(context, id):
     return base.delete(context, RESOURCE, id=id)
 
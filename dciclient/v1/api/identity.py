@@ -23,7 +23,8 @@ def get(context):
 
 
 def my_team_id(context):
-    """Asks the control-server for the team_id of the currently
-    authenticated resource.
+    """Returns the team_id of the currently authenticated resource.
+
+    The identity is asked to the control-server only once per context.
     """
-    return get(context).json()["identity"]["team_id"]
+    return context.identity["team_id"]
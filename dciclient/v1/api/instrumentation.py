@@ -0,0 +1,191 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Timing of the requests sent by a context.
+
+Every request of context.session is described by an event dict:
+- method, url and endpoint, the path below the API root with the ids
+  replaced by <id>, e.g. /jobs/<id>/files
+- status, None when no response was received, and error
+- bytes_out and bytes_in, the sizes of the request and response bodies
+- ttfb, the seconds until the response headers were received, latency, the
+  seconds until the response was fully read
+- retries, the number of retries done by the session, see retry.py, also
+  set when the last attempt raised
+- signing_time, the seconds spent signing the request
+- cached and coalesced, True when no request was sent because the response
+  came from the cache or from an identical concurrent request
+
+The pre request hooks are called with the event before the request, with
+only method, url and endpoint set, the post request hooks with the complete
+event. Latencies are also aggregated per endpoint in histograms, and the
+time spent decoding the response bodies is summed in decode_time.
+
+The state of the circuit breaker of each host, see circuit.py, is kept in
+circuits and the circuit hooks are called with a {"host", "state"} event
+on every state change.
+"""
+
+import re
+import threading
+
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+
+# upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_ID_RE = re.compile(
+    r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)"
+    r"|/[0-9]+(?=/|$)",
+    re.IGNORECASE,
+)
+
+
+def endpoint(url, api_root=None):
+    """Return the endpoint template of a URL, e.g. /jobs/<id>/files"""
+    path = urlparse(url).path
+    if api_root:
+        root = urlparse(api_root).path.rstrip("/")
+        if path.startswith(root + "/"):
+            path = path[len(root):]
+    return _ID_RE.sub("/<id>", path)
+
+
+class Histogram(object):
+    """Latencies of the requests to an endpoint."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def observe(self, event):
+        latency = event["latency"]
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if latency <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += latency
+        self.max = max(self.max, latency)
+        if event["error"] is not None or (event["status"] or 0) >= 500:
+            self.errors += 1
+        self.bytes_in += event["bytes_in"] or 0
+        self.bytes_out += event["bytes_out"] or 0
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return None
+        rank = self.count * q / 100.0
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+
+class Instrumentation(object):
+    """Request hooks and per endpoint histograms of a context."""
+
+    def __init__(self):
+        self.pre_request_hooks = []
+        self.post_request_hooks = []
+        self.histograms = {}
+        # time spent decoding the JSON response bodies
+        self.decode_time = 0.0
+        self.decoded_bytes = 0
+        self.circuits = {}
+        self.circuit_hooks = []
+        self._lock = threading.Lock()
+
+    def add_pre_request_hook(self, hook):
+        self.pre_request_hooks.append(hook)
+
+    def add_post_request_hook(self, hook):
+        self.post_request_hooks.append(hook)
+
+    def add_circuit_hook(self, hook):
+        self.circuit_hooks.append(hook)
+
+    def circuit_changed(self, host, state):
+        """Listener of the circuit breakers, see circuit.py"""
+        with self._lock:
+            self.circuits[host] = state
+        for hook in self.circuit_hooks:
+            hook({"host": host, "state": state})
+
+    def before(self, event):
+        for hook in self.pre_request_hooks:
+            hook(event)
+
+    def after(self, event):
+        key = (event["method"], event["endpoint"])
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(event)
+        for hook in self.post_request_hooks:
+            hook(event)
+
+    def record_decode(self, seconds, size):
+        with self._lock:
+            self.decode_time += seconds
+            self.decoded_bytes += size
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.decode_time = 0.0
+            self.decoded_bytes = 0
+
+    def summary(self):
+        """Return a list of per endpoint stats, the slowest endpoints first."""
+        with self._lock:
+            items = list(self.histograms.items())
+        stats = [
+            {
+                "method": method,
+                "endpoint": path,
+                "count": h.count,
+                "errors": h.errors,
+                "total": h.sum,
+                "mean": h.mean,
+                "p50": h.percentile(50),
+                "p95": h.percentile(95),
+                "max": h.max,
+                "bytes_in": h.bytes_in,
+                "bytes_out": h.bytes_out,
+            }
+            for (method, path), h in items
+        ]
+        return sorted(stats, key=lambda s: s["total"], reverse=True)
@@ -15,13 +15,27 @@
 # under the License.
 
 from dciclient.v1.api import base
+from dciclient.v1.api import models
+from dciclient.v1.api import file as dci_file
+from dciclient.v1.api import parallel
 from dciclient.v1.api import remoteci
 from dciclient.v1.api import topic
 from dciclient.v1 import utils
 from dciclient.v1.api.tag import add_tag_to_resource, delete_tag_from_resource
 
+import time
+
 
 RESOURCE = "jobs"
+# the statuses of a finished job, as the control server defines them
+FINAL_STATUSES = [
+    "success",
+    "failure",
+    "killed",
+    "product-failure",
+    "deployment-failure",
+    "error",
+]
 
 
 def create(
@@ -87,6 +101,10 @@ def iter(context, **kwargs):
     return base.iter(context, RESOURCE, **kwargs)
 
 
+def iter_models(context, **kwargs):
+    return base.iter_models(context, RESOURCE, models.Job, **kwargs)
+
+
 def get_components(context, id):
     uri = "%s/%s/%s/components" % (context.dci_cs_api, RESOURCE, id)
     return context.session.get(uri)
@@ -104,6 +122,12 @@ def list_files_iter(context, id, **kwargs):
     return base.iter(context, RESOURCE, id=id, subresource="files", **kwargs)
 
 
+def list_files_iter_models(context, id, **kwargs):
+    return base.iter_models(
+        context, RESOURCE, models.File, id=id, subresource="files", **kwargs
+    )
+
+
 def list_issues(context, id, **kwargs):
     return base.list(context, RESOURCE, id=id, subresource="issues", **kwargs)
 
@@ -124,12 +148,92 @@ def list_jobstates(context, id, **kwargs):
     return base.list(context, RESOURCE, id=id, subresource="jobstates", **kwargs)
 
 
+def list_jobstates_iter_models(context, id, **kwargs):
+    return base.iter_models(
+        context, RESOURCE, models.Jobstate, id=id, subresource="jobstates", **kwargs
+    )
+
+
+def iter_output(context, id, workers=parallel.DEFAULT_WORKERS):
+    """Iter over the content of the files attached to the job jobstates.
+
+    The files are listed in a single paginated pass and their contents are
+    downloaded concurrently, they are yielded in the jobstates order.
+    """
+    jobstates = list_jobstates(context, id=id, sort="created_at").json()["jobstates"]
+    files_by_jobstate = {}
+    for f in list_files_iter(context, id=id, sort="created_at", limit=100):
+        files_by_jobstate.setdefault(f["jobstate_id"], []).append(f)
+    files = [f for js in jobstates for f in files_by_jobstate.get(js["id"], [])]
+
+    def _content(f):
+        return dci_file.content(context, id=f["id"]).text
+
+    return parallel.imap(_content, files, workers=workers)
+
+
+def follow_output(
+    context, id, poll_interval=2, max_poll_interval=30, workers=parallel.DEFAULT_WORKERS
+):
+    """Iter over the job output as it is produced, until the job is over.
+
+    Only the files created since the last poll are listed and downloaded,
+    the polling interval doubles up to max_poll_interval while the job
+    stays idle.
+    """
+    seen = set()
+    last_created_at = None
+    interval = poll_interval
+    while True:
+        last = list_jobstates(context, id=id, sort="-created_at", limit=1)
+        last = last.json()["jobstates"]
+        done = bool(last) and last[0]["status"] in FINAL_STATUSES
+
+        new_files = []
+        listed = set()
+        for f in list_files_iter(context, id=id, sort="-created_at", limit=50):
+            if last_created_at and f["created_at"] < last_created_at:
+                break
+            # the files created during the listing shift the pages, a file
+            # on a page boundary is listed twice
+            if f["id"] not in seen and f["id"] not in listed and f["jobstate_id"]:
+                listed.add(f["id"])
+                new_files.append(f)
+        new_files.reverse()
+
+        def _content(f):
+            return dci_file.content(context, id=f["id"]).text
+
+        for content in parallel.imap(_content, new_files, workers=workers):
+            yield content
+        for f in new_files:
+            seen.add(f["id"])
+            last_created_at = max(last_created_at or f["created_at"], f["created_at"])
+
+        if done:
+            return
+        interval = poll_interval if new_files else min(interval * 2, max_poll_interval)
+        time.sleep(interval)
+
+
 def list_tests(context, id, **kwargs):
-    j = base.get(context, RESOURCE, id=id, **kwargs).json()["job"]
-    result = {"tests": []}
-    result["tests"] += topic.list_tests(context, j["topic_id"]).json()["tests"]
-    result["tests"] += remoteci.list_tests(context, j["remoteci_id"]).json()["tests"]
-    return result
+    def _job():
+        return base.get(context, RESOURCE, id=id, **kwargs).json()["job"]
+
+    def _topic_tests(job):
+        return topic.list_tests(context, job["topic_id"]).json()["tests"]
+
+    def _remoteci_tests(job):
+        return remoteci.list_tests(context, job["remoteci_id"]).json()["tests"]
+
+    r = parallel.run_dag(
+        {
+            "job": (_job, []),
+            "topic_tests": (_topic_tests, ["job"]),
+            "remoteci_tests": (_remoteci_tests, ["job"]),
+        }
+    )
+    return {"tests": r["topic_tests"] + r["remoteci_tests"]}
 
 
 def list_tags(context, id):
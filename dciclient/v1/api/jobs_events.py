@@ -14,8 +14,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from dciclient.v1.api import base
+from dciclient.v1.api import parallel
 
+import time
 
 RESOURCE = "jobs_events"
 
@@ -26,21 +27,33 @@ def list(context, sequence, limit=10, offset=0):
     return context.session.get(uri, params=params)
 
 
-def iter(context, sequence, limit=10):
-    """Iter to list all the jobs events."""
+def _pages(context, sequence, limit):
     params = {"limit": limit, "offset": 0}
     uri = "%s/%s/%s" % (context.dci_cs_api, RESOURCE, sequence)
 
     while True:
         j = context.session.get(uri, params=params).json()
-        if len(j["jobs_events"]):
-            for i in j["jobs_events"]:
-                yield i
-        else:
+        if not len(j["jobs_events"]):
             break
+        yield j["jobs_events"]
         params["offset"] += params["limit"]
 
 
+def batches(context, sequence, limit=100):
+    """Iter over all the jobs events, one page at a time.
+
+    The next page is downloaded while the caller processes the current one.
+    """
+    return parallel.prefetch(_pages(context, sequence, limit))
+
+
+def iter(context, sequence, limit=100):
+    """Iter to list all the jobs events."""
+    for batch in batches(context, sequence, limit):
+        for i in batch:
+            yield i
+
+
 def delete(context, sequence):
     """Delete jobs events from a given sequence"""
     uri = "%s/%s/%s" % (context.dci_cs_api, RESOURCE, sequence)
@@ -56,7 +69,73 @@ def update_sequence(context, etag, sequence):
     uri = "%s/%s/sequence" % (context.dci_cs_api, RESOURCE)
     return context.session.put(
         uri,
-        timeout=base.HTTP_TIMEOUT,
         headers={"If-match": etag},
         json={"sequence": sequence},
     )
+
+
+class JobsEventsConsumer(object):
+    """Consume the jobs events from the sequence stored on the server.
+
+    Events are handed to `callback` one by one or to `batch_callback` as
+    lists. The stored sequence is updated only once a batch has been
+    processed without error, so an event is delivered at least once.
+    """
+
+    def __init__(
+        self,
+        context,
+        callback=None,
+        batch_callback=None,
+        batch_size=100,
+        poll_interval=1,
+        max_poll_interval=30,
+    ):
+        if (callback is None) == (batch_callback is None):
+            raise ValueError("exactly one of callback or batch_callback is required")
+        self.context = context
+        self.callback = callback
+        self.batch_callback = batch_callback
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    def _get_sequence(self):
+        r = get_sequence(self.context)
+        r.raise_for_status()
+        sequence = r.json()["sequence"]
+        return sequence["sequence"], sequence["etag"]
+
+    def poll(self):
+        """Process the next batch of events, returns its size."""
+        sequence, etag = self._get_sequence()
+        r = list(self.context, sequence, limit=self.batch_size)
+        r.raise_for_status()
+        fetched = r.json()["jobs_events"]
+        # the stored sequence is the id of the last processed event
+        events = sorted(
+            (e for e in fetched if e["id"] > sequence), key=lambda e: e["id"]
+        )
+
+        if events:
+            if self.batch_callback is not None:
+                self.batch_callback(events)
+            else:
+                for event in events:
+                    self.callback(event)
+            r = update_sequence(self.context, etag, events[-1]["id"])
+            r.raise_for_status()
+        return len(events)
+
+    def run(self, stop_event=None):
+        """Poll until stop_event is set, backing off while idle."""
+        interval = self.poll_interval
+        while stop_event is None or not stop_event.is_set():
+            if self.poll():
+                interval = self.poll_interval
+                continue
+            if stop_event is not None:
+                stop_event.wait(interval)
+            else:
+                time.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
@@ -0,0 +1,147 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Incremental decoding of the list responses.
+
+The body of a list response is read chunk by chunk and the items of its
+resource array are decoded and yielded one at a time, so only the item
+being decoded is held in memory instead of the whole page.
+"""
+
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACES = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Buffer(object):
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self):
+        """Return the next chunk as text, None at the end of the body."""
+        if self.eof:
+            return None
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.eof = True
+            chunk = b""
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, self.eof)
+        return chunk
+
+    def fill(self, size=0):
+        """Read chunks until size characters are buffered, at least one.
+
+        Returns False at the end of the body.
+        """
+        if self.eof:
+            return False
+        parts = [self.text[self.pos:]]
+        buffered = len(parts[0])
+        while True:
+            chunk = self._read()
+            if chunk is None:
+                break
+            parts.append(chunk)
+            buffered += len(chunk)
+            if buffered >= size:
+                break
+        self.text = "".join(parts)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = _WHITESPACES.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("unexpected end of JSON document")
+
+    def expect(self, char):
+        if self.peek() != char:
+            got = self.text[self.pos:][:20]
+            raise ValueError("expected %r, got %r" % (char, got))
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except ValueError:
+                # the value is incomplete, it's parsed again from its start
+                # once the buffer doubled, not after each chunk, to stay
+                # linear with the values spanning many chunks
+                if not self.fill(2 * (len(self.text) - self.pos)):
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and self.text[end - 1] not in "]}\"":
+                if self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_items(chunks, key):
+    """Yield the items of the `key` array of a JSON object.
+
+    chunks is an iterable of bytes or text, e.g. response.iter_content().
+    The other members of the object are decoded and skipped.
+    """
+    buf = _Buffer(chunks)
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+    while True:
+        name = buf.value()
+        buf.expect(":")
+        if name == key and buf.peek() == "[":
+            buf.expect("[")
+            if buf.peek() == "]":
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value()
+                    if buf.peek() == "]":
+                        buf.pos += 1
+                        break
+                    buf.expect(",")
+        else:
+            buf.value()
+        if buf.peek() == "}":
+            return
+        buf.expect(",")
+
+
+def iter_response_items(r, key):
+    """Yield the items of the `key` array of a streamed response."""
+    try:
+        for item in iter_items(r.iter_content(chunk_size=CHUNK_SIZE), key):
+            yield item
+    finally:
+        r.close()
@@ -0,0 +1,197 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Load generator simulating a fleet of remotecis.
+
+Each remoteci context runs the lifecycle of its jobs like an agent does:
+schedule a job, then for the pre-run and running states create the jobstate
+and upload a synthetic log, then create the final jobstate. The latencies
+and errors are recorded per call type.
+"""
+
+import math
+import random
+import threading
+import time
+
+from dciclient.v1.api import file
+from dciclient.v1.api import job
+from dciclient.v1.api import jobstate
+from dciclient.v1.api import parallel
+from dciclient.v1.exceptions import CircuitOpenError
+
+STATUSES = ["pre-run", "running"]
+
+
+def percentile(samples, q):
+    """Nearest-rank q-th percentile (0-100) of sorted samples."""
+    if not samples:
+        return None
+    rank = int(math.ceil(q / 100.0 * len(samples)))
+    return samples[min(max(rank, 1), len(samples)) - 1]
+
+
+class Stats(object):
+    """Latencies and errors of the calls, per call type."""
+
+    def __init__(self):
+        self.counts = {}
+        self.latencies = {}
+        self.errors = {}
+        self.start = time.time()
+        self.end = None
+        self._lock = threading.Lock()
+
+    def record(self, call, latency, error=None):
+        """Record a call, its latency is None when it's not a sample."""
+        with self._lock:
+            self.counts[call] = self.counts.get(call, 0) + 1
+            self.latencies.setdefault(call, [])
+            if latency is not None:
+                self.latencies[call].append(latency)
+            self.errors.setdefault(call, {})
+            if error is not None:
+                self.errors[call][error] = self.errors[call].get(error, 0) + 1
+
+    def summary(self):
+        duration = (self.end or time.time()) - self.start
+        rows = []
+        with self._lock:
+            for call, latencies in sorted(self.latencies.items()):
+                latencies = sorted(latencies)
+                errors = self.errors[call]
+                rows.append(
+                    {
+                        "call": call,
+                        "count": self.counts[call],
+                        "errors": sum(errors.values()),
+                        "error_types": ",".join(
+                            "%s:%s" % e for e in sorted(errors.items())
+                        ),
+                        "rate": round(self.counts[call] / duration, 2),
+                        "p50_ms": _ms(percentile(latencies, 50)),
+                        "p90_ms": _ms(percentile(latencies, 90)),
+                        "p99_ms": _ms(percentile(latencies, 99)),
+                        "max_ms": _ms(latencies[-1] if latencies else None),
+                    }
+                )
+        return rows
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def synthetic_log(size):
+    lines = []
+    length = 0
+    while length < size:
+        line = "%s loadgen: step %d done\n" % (time.strftime("%H:%M:%S"), len(lines))
+        lines.append(line)
+        length += len(line)
+    return "".join(lines)[:size]
+
+
+def _call(stats, call, func, *args, **kwargs):
+    """Call func and record its latency, returns the response or None."""
+    start = time.time()
+    try:
+        r = func(*args, **kwargs)
+    except CircuitOpenError as e:
+        # failed fast without reaching the server, not a latency sample
+        stats.record(call, None, e.__class__.__name__)
+        return None
+    except Exception as e:
+        stats.record(call, time.time() - start, e.__class__.__name__)
+        return None
+    error = r.status_code if r.status_code >= 400 else None
+    stats.record(call, time.time() - start, error)
+    return None if error else r
+
+
+def _jittered(interval, jitter):
+    return max(0, interval * random.uniform(1 - jitter, 1 + jitter))
+
+
+def simulate_remoteci(
+    context,
+    topic_id,
+    stats,
+    jobs=1,
+    interval=0,
+    jitter=0.1,
+    log_size=1024,
+    final_status="success",
+    stop_event=None,
+):
+    stop_event = stop_event or threading.Event()
+    log = synthetic_log(log_size)
+    # spread the start of the remotecis over an interval
+    if stop_event.wait(random.uniform(0, interval)):
+        return
+    for n in range(jobs):
+        r = _call(stats, "job.schedule", job.schedule, context, topic_id)
+        if r is not None:
+            job_id = r.json()["job"]["id"]
+            for status in STATUSES:
+                r = _call(
+                    stats,
+                    "jobstate.create",
+                    jobstate.create,
+                    context,
+                    status,
+                    "loadgen",
+                    job_id,
+                )
+                if r is None:
+                    continue
+                _call(
+                    stats,
+                    "file.create",
+                    file.create,
+                    context,
+                    name="%s.log" % status,
+                    content=log,
+                    mime="text/plain",
+                    jobstate_id=r.json()["jobstate"]["id"],
+                )
+            _call(
+                stats,
+                "jobstate.create",
+                jobstate.create,
+                context,
+                final_status,
+                "loadgen",
+                job_id,
+            )
+        if n + 1 < jobs and stop_event.wait(_jittered(interval, jitter)):
+            return
+
+
+def run(contexts, topic_id, stop_event=None, **kwargs):
+    """Run simulate_remoteci concurrently for each of the remoteci contexts.
+
+    The contexts should have no circuit breaker, so that the calls keep
+    reaching a degraded server. Returns the Stats of all the calls.
+    """
+    stats = Stats()
+
+    def simulate(context):
+        simulate_remoteci(context, topic_id, stats, stop_event=stop_event, **kwargs)
+
+    list(parallel.imap(simulate, contexts, workers=max(1, len(contexts))))
+    stats.end = time.time()
+    return stats
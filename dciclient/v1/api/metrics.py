@@ -0,0 +1,204 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Prometheus metrics of the requests sent to the control server.
+
+    metrics = Metrics()
+    metrics.attach(context)
+    ...
+    metrics.write_textfile("/var/lib/node_exporter/textfile/dci.prom")
+
+The requests are aggregated per resource type (jobs, files...) and method,
+the state of the circuit breakers is exported per host. The file is written
+atomically so the node_exporter textfile collector never reads a partial
+file, serve() exposes the metrics over HTTP instead.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+except ImportError:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+
+from dciclient.v1.api import circuit
+from dciclient.v1.api import instrumentation
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def resource_type(endpoint):
+    """Return the resource type of an endpoint, e.g. jobs for /jobs/<id>"""
+    return endpoint.strip("/").split("/")[0] or "root"
+
+
+def _labels(**labels):
+    return ",".join(
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in sorted(labels.items())
+    )
+
+
+def _value(v):
+    return "%d" % v if isinstance(v, int) else repr(float(v))
+
+
+class Metrics(object):
+    """Request counters and latency histograms per resource type."""
+
+    def __init__(self, buckets=instrumentation.BUCKETS):
+        self.buckets = buckets
+        self.requests = {}
+        self.histograms = {}
+        self.circuits = {}
+        self._lock = threading.Lock()
+
+    def attach(self, context):
+        context.instrumentation.add_post_request_hook(self.observe)
+        context.instrumentation.add_circuit_hook(self.observe_circuit)
+        return self
+
+    def observe_circuit(self, event):
+        """Circuit hook, see instrumentation.py"""
+        with self._lock:
+            self.circuits[event["host"]] = event["state"]
+
+    def observe(self, event):
+        """Post request hook, see instrumentation.py"""
+        key = (resource_type(event["endpoint"]), event["method"])
+        code = "error" if event["status"] is None else str(event["status"])
+        with self._lock:
+            self.requests[key + (code,)] = self.requests.get(key + (code,), 0) + 1
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = instrumentation.Histogram(
+                    self.buckets
+                )
+            histogram.observe(event)
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            requests = sorted(self.requests.items())
+            histograms = sorted(self.histograms.items())
+            circuits = sorted(self.circuits.items())
+
+        lines = [
+            "# HELP dci_client_requests_total Requests sent to the control server.",
+            "# TYPE dci_client_requests_total counter",
+        ]
+        for (resource, method, code), count in requests:
+            labels = _labels(resource=resource, method=method, code=code)
+            lines.append("dci_client_requests_total{%s} %d" % (labels, count))
+
+        lines += [
+            "# HELP dci_client_request_errors_total Requests failed with a "
+            "server error or without response.",
+            "# TYPE dci_client_request_errors_total counter",
+        ]
+        for (resource, method), h in histograms:
+            labels = _labels(resource=resource, method=method)
+            lines.append("dci_client_request_errors_total{%s} %d" % (labels, h.errors))
+
+        for name, attribute, help in [
+            ("dci_client_sent_bytes_total", "bytes_out", "Bytes uploaded."),
+            ("dci_client_received_bytes_total", "bytes_in", "Bytes downloaded."),
+        ]:
+            lines += ["# HELP %s %s" % (name, help), "# TYPE %s counter" % name]
+            for (resource, method), h in histograms:
+                labels = _labels(resource=resource, method=method)
+                lines.append("%s{%s} %d" % (name, labels, getattr(h, attribute)))
+
+        name = "dci_client_request_duration_seconds"
+        lines += [
+            "# HELP %s Latency of the requests." % name,
+            "# TYPE %s histogram" % name,
+        ]
+        for (resource, method), h in histograms:
+            cumulative = 0
+            for bound, count in zip(h.buckets + ("+Inf",), h.counts):
+                cumulative += count
+                labels = _labels(resource=resource, method=method, le=bound)
+                lines.append("%s_bucket{%s} %d" % (name, labels, cumulative))
+            labels = _labels(resource=resource, method=method)
+            lines.append("%s_sum{%s} %s" % (name, labels, _value(h.sum)))
+            lines.append("%s_count{%s} %d" % (name, labels, h.count))
+
+        if circuits:
+            lines += [
+                "# HELP dci_client_circuit_state State of the circuit breaker "
+                "of the host.",
+                "# TYPE dci_client_circuit_state gauge",
+            ]
+        for host, current in circuits:
+            for state in circuit.STATES:
+                labels = _labels(host=host, state=state)
+                value = 1 if state == current else 0
+                lines.append("dci_client_circuit_state{%s} %d" % (labels, value))
+
+        lines += [
+            "# HELP dci_client_metrics_timestamp_seconds When the metrics were "
+            "rendered.",
+            "# TYPE dci_client_metrics_timestamp_seconds gauge",
+            "dci_client_metrics_timestamp_seconds %s" % _value(time.time()),
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write the metrics to path, atomically."""
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".dci_metrics")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.rename(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def serve(self, port=9469, address="127.0.0.1"):
+        """Serve the metrics on http://address:port/metrics in a thread.
+
+        Returns the HTTP server, call its shutdown() method to stop it.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer((address, port), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
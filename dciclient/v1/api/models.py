@@ -0,0 +1,199 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Compact read-only models of the resources, for bulk processing.
+
+The attributes are stored in __slots__, the repeated values (states, ids
+of the parent resources) are interned and the `data` field is stored as a
+compact JSON string, decoded again on each access.
+
+`data` comes already decoded with the page, so storing it re-encodes it:
+building a model costs more CPU than keeping the dict, in exchange for the
+memory of the nested objects. benchmarks/models_memory.py measures both,
+keep the plain dicts when the items are short-lived.
+"""
+
+import sys
+
+from dciclient.v1.api import codec
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern  # noqa
+
+
+class Resource(object):
+    __slots__ = ("_data", "_extra")
+    FIELDS = ()
+    INTERNED = ()
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls.__new__(cls)
+        extra = dict(d)
+        for field in cls.FIELDS:
+            value = extra.pop(field, None)
+            if field in cls.INTERNED and isinstance(value, str):
+                value = _intern(value)
+            setattr(obj, field, value)
+        data = extra.pop("data", None)
+        obj._data = None if data is None else codec.dumps(data)
+        obj._extra = extra or None
+        return obj
+
+    @property
+    def data(self):
+        return None if self._data is None else codec.loads(self._data)
+
+    def __getattr__(self, name):
+        # only called for the fields that are not in __slots__
+        extra = object.__getattribute__(self, "_extra")
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def to_dict(self):
+        d = dict(self._extra or {})
+        d.update((f, getattr(self, f)) for f in self.FIELDS)
+        if self._data is not None:
+            d["data"] = self.data
+        return d
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s %s>" % (type(self).__name__, getattr(self, "id", None))
+
+
+class Job(Resource):
+    FIELDS = (
+        "id",
+        "created_at",
+        "updated_at",
+        "etag",
+        "name",
+        "comment",
+        "status",
+        "state",
+        "duration",
+        "topic_id",
+        "remoteci_id",
+        "team_id",
+        "product_id",
+        "previous_job_id",
+        "update_previous_job_id",
+        "tags",
+        "user_agent",
+        "client_version",
+    )
+    INTERNED = (
+        "status",
+        "state",
+        "topic_id",
+        "remoteci_id",
+        "team_id",
+        "product_id",
+        "user_agent",
+        "client_version",
+    )
+    __slots__ = FIELDS
+
+
+class File(Resource):
+    FIELDS = (
+        "id",
+        "created_at",
+        "updated_at",
+        "etag",
+        "name",
+        "mime",
+        "md5",
+        "size",
+        "state",
+        "job_id",
+        "jobstate_id",
+        "test_id",
+        "team_id",
+    )
+    INTERNED = ("mime", "state", "job_id", "jobstate_id", "test_id", "team_id")
+    __slots__ = FIELDS
+
+
+class Component(Resource):
+    FIELDS = (
+        "id",
+        "created_at",
+        "updated_at",
+        "released_at",
+        "etag",
+        "name",
+        "type",
+        "canonical_project_name",
+        "title",
+        "message",
+        "url",
+        "state",
+        "tags",
+        "topic_id",
+        "team_id",
+    )
+    INTERNED = ("type", "state", "topic_id", "team_id")
+    __slots__ = FIELDS
+
+
+class Jobstate(Resource):
+    FIELDS = ("id", "created_at", "status", "comment", "job_id", "team_id")
+    INTERNED = ("status", "job_id", "team_id")
+    __slots__ = FIELDS
+
+
+class Topic(Resource):
+    FIELDS = (
+        "id",
+        "created_at",
+        "updated_at",
+        "etag",
+        "name",
+        "state",
+        "component_types",
+        "export_control",
+        "product_id",
+        "next_topic_id",
+    )
+    INTERNED = ("state", "product_id", "next_topic_id")
+    __slots__ = FIELDS
+
+
+class Remoteci(Resource):
+    FIELDS = (
+        "id",
+        "created_at",
+        "updated_at",
+        "etag",
+        "name",
+        "state",
+        "public",
+        "team_id",
+    )
+    INTERNED = ("state", "team_id")
+    __slots__ = FIELDS
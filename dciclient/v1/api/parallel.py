@@ -0,0 +1,117 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from multiprocessing.pool import ThreadPool
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+from dciclient.v1.api import timeouts
+
+DEFAULT_WORKERS = 8
+
+
+def imap(func, iterable, workers=DEFAULT_WORKERS):
+    """Call func on each item with at most `workers` calls in flight.
+
+    The results are yielded in the order of the items, each one as soon as
+    it and all the previous ones are available.
+    """
+    pool = ThreadPool(workers)
+    try:
+        for result in pool.imap(timeouts.propagated(func), iterable):
+            yield result
+    finally:
+        pool.terminate()
+
+
+def prefetch(iterable):
+    """Iterate over iterable, computing the next item in a background thread
+    while the caller processes the current one.
+    """
+    it = iter(iterable)
+    end = object()
+    pool = ThreadPool(1)
+    try:
+        _next = timeouts.propagated(next)
+        pending = pool.apply_async(_next, (it, end))
+        while True:
+            item = pending.get()
+            if item is end:
+                return
+            pending = pool.apply_async(_next, (it, end))
+            yield item
+    finally:
+        pool.terminate()
+
+
+def _call_step(name, func, kwargs, done):
+    try:
+        done.put((name, None, func(**kwargs)))
+    except Exception as e:
+        done.put((name, e, None))
+
+
+def run_dag(steps, workers=DEFAULT_WORKERS):
+    """Run a set of interdependent steps, the independent ones concurrently.
+
+    `steps` maps a step name to a (func, dependencies) tuple. func is called
+    with the results of its dependencies as keyword arguments, as soon as
+    they are all available. The first error raised by a step is re-raised.
+
+    Returns a dict of the step names and their results.
+
+        run_dag({
+            "job": (lambda: get_job(), []),
+            "topic": (lambda job: get_topic(job["topic_id"]), ["job"]),
+        })
+    """
+    for name, (_, dependencies) in steps.items():
+        unknown = [d for d in dependencies if d not in steps]
+        if unknown:
+            raise ValueError("step %s depends on unknown steps %s" % (name, unknown))
+
+    results = {}
+    pending = dict(steps)
+    done = Queue()
+    running = 0
+    pool = ThreadPool(max(1, min(workers, len(steps))))
+    try:
+        while pending or running:
+            ready = [
+                name
+                for name, (_, dependencies) in pending.items()
+                if all(d in results for d in dependencies)
+            ]
+            if not ready and not running:
+                raise ValueError("circular dependencies between %s" % sorted(pending))
+            for name in ready:
+                func, dependencies = pending.pop(name)
+                kwargs = {d: results[d] for d in dependencies}
+                pool.apply_async(
+                    _call_step, (name, timeouts.propagated(func), kwargs, done)
+                )
+                running += 1
+            name, error, result = done.get()
+            running -= 1
+            if error is not None:
+                raise error
+            results[name] = result
+    finally:
+        pool.terminate()
+    return results
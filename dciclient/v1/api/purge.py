@@ -0,0 +1,87 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import base
+from dciclient.v1.api import parallel
+
+import time
+
+# a resource is purged only once the resources referencing it are purged
+DEPENDENCIES = {
+    "files": [],
+    "jobs": ["files"],
+    "components": ["jobs"],
+    "remotecis": ["jobs"],
+    "tests": ["remotecis"],
+    "topics": ["components", "jobs"],
+    "products": ["topics"],
+    "users": [],
+    "feeders": [],
+    "teams": ["users", "remotecis", "jobs", "tests", "feeders", "products"],
+}
+RESOURCES = sorted(DEPENDENCIES)
+
+
+def _all_dependencies(res):
+    """Return the types purged before res, directly or transitively."""
+    found = set()
+    pending = list(DEPENDENCIES[res])
+    while pending:
+        dependency = pending.pop()
+        if dependency not in found:
+            found.add(dependency)
+            pending.extend(DEPENDENCIES[dependency])
+    return found
+
+
+def preview(context, resources=RESOURCES, workers=parallel.DEFAULT_WORKERS):
+    """Query concurrently the resources to be purged.
+
+    Returns a dict of the resource types and their purge GET responses.
+    """
+    responses = parallel.imap(
+        lambda res: base.purge(context, res, force=False), resources, workers
+    )
+    return dict(zip(resources, responses))
+
+
+def purge(context, counts, workers=parallel.DEFAULT_WORKERS):
+    """Purge the resource types with a non zero count.
+
+    The types are purged in dependency order, the independent ones
+    concurrently. A type is skipped when the purge of one of the types it
+    depends on failed. Returns a dict of the purged types and the (response,
+    duration) of their purge, the response is None for the skipped types.
+    """
+    to_purge = [res for res, count in counts.items() if count]
+
+    def _purge(res):
+        def step(**dependencies):
+            if any(r is None or r.status_code != 204 for r, _ in dependencies.values()):
+                return None, 0.0
+            start = time.time()
+            r = base.purge(context, res, force=True)
+            return r, time.time() - start
+
+        return step
+
+    # the transitive dependencies keep the order when a type in between has
+    # nothing to purge
+    steps = {
+        res: (_purge(res), sorted(_all_dependencies(res).intersection(to_purge)))
+        for res in to_purge
+    }
+    return parallel.run_dag(steps, workers)
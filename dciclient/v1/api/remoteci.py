@@ -15,6 +15,7 @@
 # under the License.
 
 from dciclient.v1.api import base
+from dciclient.v1.api import models
 
 
 RESOURCE = "remotecis"
@@ -30,6 +31,10 @@ def list(context, **kwargs):
     return base.list(context, RESOURCE, **kwargs)
 
 
+def iter_models(context, **kwargs):
+    return base.iter_models(context, RESOURCE, models.Remoteci, **kwargs)
+
+
 def get(context, id, **kwargs):
     return base.get(context, RESOURCE, id=id, **kwargs)
 
@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Retry policy of the requests sent by a context.
+
+A failed request is retried with an exponential backoff and a random
+jitter, or after the delay of the Retry-After header of a 429 or 503
+response, until max_retries or max_retry_time is reached.
+
+A request the server may have processed (502 and 504 responses, errors
+while reading the response) is only retried when it is idempotent: GET, HEAD,
+OPTIONS, PUT and DELETE requests, the PUT and DELETE of the API being
+conditional on their etag, and requests with an Idempotency-Key header.
+A request the server did not process (connection failures, 429 and 503
+responses) is retried whatever its method. In both cases the body must be
+replayable: no body, bytes or a seekable file.
+"""
+
+import email.utils
+import random
+import time
+
+import requests
+
+try:
+    from requests.packages.urllib3.exceptions import ConnectTimeoutError
+    from requests.packages.urllib3.exceptions import NewConnectionError
+except ImportError:
+    from urllib3.exceptions import ConnectTimeoutError
+    from urllib3.exceptions import NewConnectionError
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+# 500 is left out, it's usually a server bug that a retry won't fix
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+# statuses meaning that the request was not processed
+NOT_PROCESSED_STATUSES = frozenset([429, 503])
+
+
+def retry_after(response):
+    """Return the seconds to wait of the Retry-After header, or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+
+def rewinder(body):
+    """Return a function rewinding the body, None if it can't be replayed."""
+    if body is None or isinstance(body, (bytes, type(u""), dict, list, tuple)):
+        return lambda: None
+    if hasattr(body, "seek") and hasattr(body, "tell"):
+        try:
+            position = body.tell()
+        except (IOError, OSError):
+            return None
+        return lambda: body.seek(position)
+    return None
+
+
+def not_sent(error):
+    """True when the request failed before reaching the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+class RetryPolicy(object):
+    def __init__(
+        self,
+        max_retries=0,
+        backoff_factor=0.5,
+        max_backoff=30,
+        max_retry_time=300,
+        jitter=True,
+        statuses=RETRY_STATUSES,
+        idempotency_header="Idempotency-Key",
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_time = max_retry_time
+        self.jitter = jitter
+        self.statuses = statuses
+        self.idempotency_header = idempotency_header.lower()
+
+    def backoff(self, retry):
+        """Seconds to wait before the retry-th retry, starting at 1."""
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (retry - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def is_idempotent(self, method, headers):
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return self.idempotency_header in [h.lower() for h in (headers or {})]
+
+    def delay(self, method, headers, retry, elapsed, response=None, error=None):
+        """Return the seconds to wait before retrying, None to give up.
+
+        retry is the number of the retry to come, starting at 1, and
+        elapsed the seconds since the first attempt.
+        """
+        if retry > self.max_retries:
+            return None
+        if error is not None:
+            processed = not not_sent(error)
+            delay = self.backoff(retry)
+        elif response.status_code in self.statuses:
+            processed = response.status_code not in NOT_PROCESSED_STATUSES
+            delay = self.backoff(retry)
+            if not processed:
+                delay = max(delay, retry_after(response) or 0)
+        else:
+            return None
+        if processed and not self.is_idempotent(method, headers):
+            return None
+        if elapsed + delay > self.max_retry_time:
+            return None
+        return delay
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
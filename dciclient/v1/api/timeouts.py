@@ -0,0 +1,122 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Timeouts of the requests sent by a context.
+
+Each request without an explicit timeout gets the (connect, read) timeout
+of context.session.timeouts, possibly overridden per resource type, the
+first path segment below the API root:
+
+    context.session.timeouts.overrides["files"] = (10, 3600)
+
+A deadline bounds the total duration of a group of calls, including the
+retries and the requests sent by the worker threads of parallel.py:
+
+    with timeouts.deadline(30):
+        job.list_tests(context, job_id)
+
+Within it the timeouts are shortened to the remaining time, the retries
+that can't be done in time are given up and the requests sent past the
+deadline raise DeadlineExceeded.
+"""
+
+import contextlib
+import functools
+import threading
+import time
+
+from dciclient.v1.exceptions import DeadlineExceeded
+
+CONNECT_TIMEOUT = 30
+READ_TIMEOUT = 600
+
+_local = threading.local()
+
+
+def current_deadline():
+    """Return the deadline of the current thread, as a timestamp, or None."""
+    return getattr(_local, "deadline", None)
+
+
+@contextlib.contextmanager
+def deadline(seconds=None, at=None):
+    """Set the deadline of the calls done within the block.
+
+    A nested deadline can't extend the enclosing one.
+    """
+    previous = current_deadline()
+    if at is None:
+        at = time.time() + seconds
+    if previous is not None:
+        at = min(at, previous)
+    _local.deadline = at
+    try:
+        yield at
+    finally:
+        _local.deadline = previous
+
+
+def remaining():
+    """Return the seconds left before the deadline, None without deadline."""
+    at = current_deadline()
+    return None if at is None else at - time.time()
+
+
+def allows(delay):
+    """Return whether waiting delay seconds still ends before the deadline."""
+    left = remaining()
+    return left is None or delay < left
+
+
+def propagated(func):
+    """Wrap func to call it, in any thread, under the current deadline."""
+    at = current_deadline()
+    if at is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with deadline(at=at):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _cap(timeout, left):
+    if timeout is None:
+        return left
+    return min(timeout, left)
+
+
+class TimeoutPolicy(object):
+    def __init__(self, connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, overrides=None):
+        self.connect = connect
+        self.read = read
+        # resource type -> (connect, read)
+        self.overrides = dict(overrides or {})
+
+    def timeout(self, resource=None, timeout=None):
+        """Return the timeout of a request, timeout is the caller's one."""
+        if timeout is None:
+            timeout = self.overrides.get(resource, (self.connect, self.read))
+        left = remaining()
+        if left is None:
+            return timeout
+        if left <= 0:
+            raise DeadlineExceeded("deadline exceeded by %.1fs" % -left)
+        if isinstance(timeout, tuple):
+            return tuple(_cap(t, left) for t in timeout)
+        return _cap(timeout, left)
@@ -15,6 +15,7 @@
 # under the License.
 
 from dciclient.v1.api import base
+from dciclient.v1.api import models
 
 
 RESOURCE = "topics"
@@ -51,6 +52,10 @@ def list(context, **kwargs):
     return base.list(context, RESOURCE, **kwargs)
 
 
+def iter_models(context, **kwargs):
+    return base.iter_models(context, RESOURCE, models.Topic, **kwargs)
+
+
 def get(context, id, **kwargs):
     return base.get(context, RESOURCE, id=id, **kwargs)
 
@@ -109,6 +114,12 @@ def list_components(context, id, **kwargs):
     return base.list(context, RESOURCE, id=id, subresource="components", **kwargs)
 
 
+def list_components_iter_models(context, id, **kwargs):
+    return base.iter_models(
+        context, RESOURCE, models.Component, id=id, subresource="components", **kwargs
+    )
+
+
 def list_tests(context, id, **kwargs):
     return base.list(context, RESOURCE, id=id, subresource="tests", **kwargs)
 
@@ -14,6 +14,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import requests
+
 
 class ClientError(Exception):
     """DCI client error."""
@@ -29,3 +31,11 @@ class DuplicateResource(ServerError):
 
 class BadParameter(Exception):
     """Bad parameter"""
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The control server is failing, the request was not sent"""
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The deadline of the call passed, the request was not sent"""
@@ -33,6 +33,20 @@ def parse_arguments(args, environment={}):
     base_parser = ArgumentParser(add_help=False)
     base_parser.add_argument("--verbose", "--long", default=False, action="store_true")
 
+    fields_parser = ArgumentParser(add_help=False)
+    fields_parser.add_argument(
+        "--fields", default=None, help="Comma separated list of fields to retrieve."
+    )
+
+    offline_parser = ArgumentParser(add_help=False)
+    offline_parser.add_argument(
+        "--offline",
+        default=False,
+        action="store_true",
+        help="Answer from the local mirror, see mirror-sync.",
+    )
+    offline_parser.add_argument("--mirror-db", default=environment.get("DCI_MIRROR_DB"))
+
     parser = ArgumentParser(prog="dcictl")
     parser.add_argument(
         "--version", action="version", version="%(prog)s " + __version__
@@ -88,6 +102,25 @@ def parse_arguments(args, environment={}):
         action="store_true",
         help="Refresh the token",
     )
+    parser.add_argument(
+        "--metrics-file",
+        default=environment.get("DCI_METRICS_FILE"),
+        help="Write the Prometheus metrics of the requests to this file or "
+        "'DCI_METRICS_FILE' environment variable.",
+    )
+    parser.add_argument(
+        "--timing",
+        default=False,
+        action="store_true",
+        help="Print the time spent in each phase of the command to stderr.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Dump a cProfile statistics file of the command, the imports "
+        "are done before the profiler starts, see --timing for their time "
+        "and python -m pstats.",
+    )
     parser.add_argument(
         "--format",
         default="table",
@@ -98,7 +131,7 @@ def parse_arguments(args, environment={}):
     subparsers = parser.add_subparsers()
     # user commands
     p = subparsers.add_parser(
-        "user-list", help="List all users.", parents=[base_parser]
+        "user-list", help="List all users.", parents=[base_parser, fields_parser]
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -137,13 +170,15 @@ def parse_arguments(args, environment={}):
     p.add_argument("--etag", required=True)
     p.set_defaults(command="user-delete")
 
-    p = subparsers.add_parser("user-show", help="Show a user.", parents=[base_parser])
+    p = subparsers.add_parser(
+        "user-show", help="Show a user.", parents=[base_parser, fields_parser]
+    )
     p.add_argument("id")
     p.set_defaults(command="user-show")
 
     # team commands
     p = subparsers.add_parser(
-        "team-list", help="List all teams.", parents=[base_parser]
+        "team-list", help="List all teams.", parents=[base_parser, fields_parser]
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -177,7 +212,9 @@ def parse_arguments(args, environment={}):
     p.add_argument("--etag", required=True)
     p.set_defaults(command="team-delete")
 
-    p = subparsers.add_parser("team-show", help="Show a team.", parents=[base_parser])
+    p = subparsers.add_parser(
+        "team-show", help="Show a team.", parents=[base_parser, fields_parser]
+    )
     p.add_argument("id")
     p.set_defaults(command="team-show")
 
@@ -219,7 +256,7 @@ def parse_arguments(args, environment={}):
 
     # product commands
     p = subparsers.add_parser(
-        "product-list", help="List all products.", parents=[base_parser]
+        "product-list", help="List all products.", parents=[base_parser, fields_parser]
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -256,7 +293,7 @@ def parse_arguments(args, environment={}):
     p.set_defaults(command="product-delete")
 
     p = subparsers.add_parser(
-        "product-show", help="Show a product.", parents=[base_parser]
+        "product-show", help="Show a product.", parents=[base_parser, fields_parser]
     )
     p.add_argument("id")
     p.set_defaults(command="product-show")
@@ -289,7 +326,7 @@ def parse_arguments(args, environment={}):
 
     # feeder commands
     p = subparsers.add_parser(
-        "feeder-list", help="List all feeders.", parents=[base_parser]
+        "feeder-list", help="List all feeders.", parents=[base_parser, fields_parser]
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -325,7 +362,7 @@ def parse_arguments(args, environment={}):
     p.set_defaults(command="feeder-delete")
 
     p = subparsers.add_parser(
-        "feeder-show", help="Show a feeder.", parents=[base_parser]
+        "feeder-show", help="Show a feeder.", parents=[base_parser, fields_parser]
     )
     p.add_argument("id")
     p.set_defaults(command="feeder-show")
@@ -341,7 +378,9 @@ def parse_arguments(args, environment={}):
 
     # topic commands
     p = subparsers.add_parser(
-        "topic-list", help="List all topics.", parents=[base_parser]
+        "topic-list",
+        help="List all topics.",
+        parents=[base_parser, fields_parser, offline_parser],
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -389,7 +428,9 @@ def parse_arguments(args, environment={}):
     p.add_argument("id")
     p.set_defaults(command="topic-delete")
 
-    p = subparsers.add_parser("topic-show", help="Show a topic.", parents=[base_parser])
+    p = subparsers.add_parser(
+        "topic-show", help="Show a topic.", parents=[base_parser, fields_parser]
+    )
     p.add_argument("id")
     p.set_defaults(command="topic-show")
 
@@ -419,14 +460,16 @@ def parse_arguments(args, environment={}):
 
     # jobstate commands
     p = subparsers.add_parser(
-        "jobstate-show", help="Show a jobstate.", parents=[base_parser]
+        "jobstate-show", help="Show a jobstate.", parents=[base_parser, fields_parser]
     )
     p.add_argument("id")
     p.set_defaults(command="jobstate-show")
 
     # component commands
     p = subparsers.add_parser(
-        "component-list", help="List all components.", parents=[base_parser]
+        "component-list",
+        help="List all components.",
+        parents=[base_parser, fields_parser, offline_parser],
     )
     p.add_argument("--topic-id", required=True, dest="id")
     p.add_argument("--sort", default="-created_at")
@@ -465,7 +508,19 @@ def parse_arguments(args, environment={}):
     p.set_defaults(command="component-delete")
 
     p = subparsers.add_parser(
-        "component-show", help="Show a component.", parents=[base_parser]
+        "component-import",
+        help="Create or update the components of a YAML/JSON manifest.",
+        parents=[base_parser],
+    )
+    p.add_argument("manifest", help="Manifest file, a list of components")
+    p.add_argument("--topic-id", help="Topic ID, the manifest topic_id by default")
+    p.add_argument(
+        "--workers", type=int, default=8, help="Number of concurrent requests."
+    )
+    p.set_defaults(command="component-import")
+
+    p = subparsers.add_parser(
+        "component-show", help="Show a component.", parents=[base_parser, fields_parser]
     )
     p.add_argument("id")
     p.set_defaults(command="component-show")
@@ -546,7 +601,7 @@ def parse_arguments(args, environment={}):
 
     # file commands
     p = subparsers.add_parser(
-        "file-list", help="List all files.", parents=[base_parser]
+        "file-list", help="List all files.", parents=[base_parser, fields_parser]
     )
     p.add_argument("job_id")
     p.add_argument("--sort", default="-created_at")
@@ -566,14 +621,20 @@ def parse_arguments(args, environment={}):
     p.set_defaults(command="file-delete")
 
     # job commands
-    p = subparsers.add_parser("job-list", help="List all jobs.", parents=[base_parser])
+    p = subparsers.add_parser(
+        "job-list",
+        help="List all jobs.",
+        parents=[base_parser, fields_parser, offline_parser],
+    )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=10)
     p.add_argument("--offset", default=0)
     p.add_argument("--where", help="Optional filter criteria", required=False)
     p.set_defaults(command="job-list")
 
-    p = subparsers.add_parser("job-show", help="Show a job.", parents=[base_parser])
+    p = subparsers.add_parser(
+        "job-show", help="Show a job.", parents=[base_parser, fields_parser]
+    )
     p.add_argument("id")
     p.set_defaults(command="job-show")
 
@@ -619,6 +680,18 @@ def parse_arguments(args, environment={}):
         "job-output", help="Show the job output.", parents=[base_parser]
     )
     p.add_argument("id")
+    p.add_argument(
+        "--follow",
+        default=False,
+        action="store_true",
+        help="Keep printing the new output until the job is over.",
+    )
+    p.add_argument(
+        "--poll-interval",
+        default=2,
+        type=float,
+        help="Seconds between two polls in follow mode.",
+    )
     p.set_defaults(command="job-output")
 
     p = subparsers.add_parser(
@@ -697,7 +770,7 @@ def parse_arguments(args, environment={}):
 
     # test commands
     p = subparsers.add_parser(
-        "test-list", help="List all tests.", parents=[base_parser]
+        "test-list", help="List all tests.", parents=[base_parser, fields_parser]
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -729,13 +802,17 @@ def parse_arguments(args, environment={}):
     p.add_argument("id")
     p.set_defaults(command="test-delete")
 
-    p = subparsers.add_parser("test-show", help="Show a test.", parents=[base_parser])
+    p = subparsers.add_parser(
+        "test-show", help="Show a test.", parents=[base_parser, fields_parser]
+    )
     p.add_argument("id")
     p.set_defaults(command="test-show")
 
     # remoteci commands
     p = subparsers.add_parser(
-        "remoteci-list", help="List all remotecis.", parents=[base_parser]
+        "remoteci-list",
+        help="List all remotecis.",
+        parents=[base_parser, fields_parser, offline_parser],
     )
     p.add_argument("--sort", default="-created_at")
     p.add_argument("--limit", default=50)
@@ -771,7 +848,7 @@ def parse_arguments(args, environment={}):
     p.set_defaults(command="remoteci-delete")
 
     p = subparsers.add_parser(
-        "remoteci-show", help="Show a remoteci.", parents=[base_parser]
+        "remoteci-show", help="Show a remoteci.", parents=[base_parser, fields_parser]
     )
     p.add_argument("id")
     p.set_defaults(command="remoteci-show")
@@ -875,5 +952,81 @@ def parse_arguments(args, environment={}):
     )
     p.set_defaults(command="purge")
 
+    # loadgen command
+    p = subparsers.add_parser(
+        "loadgen",
+        help="Simulate remotecis running jobs and report the latencies.",
+        parents=[base_parser],
+    )
+    p.add_argument("--topic-id", required=True)
+    p.add_argument(
+        "--team-id", help="Team of the simulated remotecis, yours by default."
+    )
+    p.add_argument(
+        "--remotecis", type=int, default=10, help="Number of simulated remotecis."
+    )
+    p.add_argument(
+        "--jobs", type=int, default=1, help="Number of jobs run by each remoteci."
+    )
+    p.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="Seconds between the jobs of a remoteci.",
+    )
+    p.add_argument(
+        "--jitter",
+        type=float,
+        default=0.1,
+        help="Random variation of the interval, 0.1 for +/-10%%.",
+    )
+    p.add_argument(
+        "--log-size", type=int, default=1024, help="Size of the uploaded logs."
+    )
+    p.add_argument(
+        "--final-status",
+        default="success",
+        choices=[
+            "success",
+            "failure",
+            "killed",
+            "product-failure",
+            "deployment-failure",
+            "error",
+        ],
+    )
+    p.set_defaults(command="loadgen")
+
+    # mirror commands
+    p = subparsers.add_parser(
+        "mirror-sync",
+        help="Sync resources into the local mirror.",
+        parents=[base_parser],
+    )
+    p.add_argument(
+        "--resource", default=None, help="Comma separated list of resource to sync."
+    )
+    p.add_argument(
+        "--full",
+        default=False,
+        action="store_true",
+        help="Drop the mirrored resources and sync them again.",
+    )
+    p.add_argument("--mirror-db", default=environment.get("DCI_MIRROR_DB"))
+    p.set_defaults(command="mirror-sync")
+
+    p = subparsers.add_parser(
+        "mirror-query",
+        help="Query a resource from the local mirror.",
+        parents=[base_parser],
+    )
+    p.add_argument("resource")
+    p.add_argument("--sort", default="-created_at")
+    p.add_argument("--limit", default=50)
+    p.add_argument("--offset", default=0)
+    p.add_argument("--where", help="Optional filter criteria", required=False)
+    p.add_argument("--mirror-db", default=environment.get("DCI_MIRROR_DB"))
+    p.set_defaults(command="mirror-query")
+
     args = parser.parse_args(args)
     return args
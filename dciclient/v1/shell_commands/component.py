@@ -14,15 +14,24 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from dciclient.v1.exceptions import BadParameter
 from dciclient.v1.utils import active_string
 from dciclient.v1.utils import validate_json
 
 from dciclient.v1.api import component
 from dciclient.v1.api import topic
+from dciclient.v1.shell_commands import mirror
+
+import datetime
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["id", "sort", "limit", "offset", "where"]}
+    if args.offline:
+        return mirror.offline_list(args, "components", topic_id=args.id)
+    params = {
+        k: getattr(args, k)
+        for k in ["id", "sort", "limit", "offset", "where", "fields"]
+    }
     return topic.list_components(context, **params)
 
 
@@ -46,12 +55,60 @@ def create(context, args):
     return component.create(context, **params)
 
 
+def _load_manifest(path):
+    # imported here, it's slow to import and only needed by this command
+    import yaml
+
+    with open(path) as f:
+        try:
+            manifest = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise BadParameter("%s is not a valid manifest: %s" % (path, e))
+    if isinstance(manifest, type([])):
+        manifest = {"components": manifest}
+    if not isinstance(manifest, dict) or not isinstance(
+        manifest.get("components"), type([])
+    ):
+        raise BadParameter("%s has no list of components" % path)
+    for c in manifest["components"]:
+        if not isinstance(c, dict) or "name" not in c or "type" not in c:
+            raise BadParameter("each component needs a name and a type: %s" % c)
+        if "topic_id" in c:
+            raise BadParameter(
+                "the topic_id is set on the manifest, not on a component: %s" % c
+            )
+    manifest["components"] = _normalize(manifest["components"])
+    return manifest
+
+
+def _normalize(value):
+    # YAML parses the unquoted dates, they are sent as the server's strings
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return dict((k, _normalize(v)) for k, v in value.items())
+    if isinstance(value, type([])):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def import_manifest(context, args):
+    manifest = _load_manifest(args.manifest)
+    topic_id = args.topic_id or manifest.get("topic_id")
+    if not topic_id:
+        raise BadParameter("no --topic-id and no topic_id in the manifest")
+    reports = component.create_many(
+        context, topic_id, manifest["components"], workers=args.workers
+    )
+    return {"components": reports}
+
+
 def delete(context, args):
     return component.delete(context, args.id)
 
 
 def show(context, args):
-    return component.get(context, args.id)
+    return component.get(context, args.id, fields=args.fields)
 
 
 def file_upload(context, args):
@@ -19,7 +19,9 @@ from dciclient.v1.utils import active_string
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     return feeder.list(context, **params)
 
 
@@ -30,7 +32,7 @@ def create(context, args):
 
 
 def show(context, args):
-    return feeder.get(context, args.id)
+    return feeder.get(context, args.id, fields=args.fields)
 
 
 def update(context, args):
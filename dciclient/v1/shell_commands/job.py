@@ -14,18 +14,25 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import sys
+
 from dciclient.v1.api import file as dci_file
 from dciclient.v1.api import job
+from dciclient.v1.shell_commands import mirror
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    if args.offline:
+        return mirror.offline_list(args, "jobs")
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     params["embed"] = "topic,remoteci,team"
     return job.list(context, **params)
 
 
 def show(context, args):
-    return job.get(context, id=args.id)
+    return job.get(context, id=args.id, fields=args.fields)
 
 
 def delete(context, args):
@@ -51,17 +58,15 @@ def list_issues(context, args):
 
 
 def output(context, args):
-    result = job.list_jobstates(context, id=args.id, sort="created_at")
-    jobstates = result.json()["jobstates"]
-
-    res = []
-    for js in jobstates:
-        f_l = job.list_files(
-            context, id=args.id, where="jobstate_id:" + js["id"], sort="created_at"
+    if args.follow:
+        contents = job.follow_output(
+            context, id=args.id, poll_interval=args.poll_interval
         )
-        for f in f_l.json()["files"]:
-            res.append(dci_file.content(context, id=f["id"]).text)
-    return res
+    else:
+        contents = job.iter_output(context, id=args.id)
+    for content in contents:
+        print(content)
+        sys.stdout.flush()
 
 
 def list_tests(context, args):
@@ -0,0 +1,62 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import uuid
+
+from dciclient.v1.api import context as dci_context
+from dciclient.v1.api import identity
+from dciclient.v1.api import loadgen as api_loadgen
+from dciclient.v1.api import remoteci
+
+
+def _remoteci_context(context, rci):
+    c = dci_context.DciSignatureContext(
+        context.dci_cs_url, rci["id"], rci["api_secret"]
+    )
+    # share the adapters mounted on top of the default ones, e.g. the
+    # in-process control server of the tests
+    for prefix, adapter in context.session.adapters.items():
+        if prefix not in c.session.adapters:
+            c.session.mount(prefix, adapter)
+    # failing fast would hide the latencies of a degraded server
+    c.session.circuit_breakers = None
+    return c
+
+
+def loadgen(context, args):
+    team_id = args.team_id or identity.my_team_id(context)
+    prefix = "loadgen-%s" % uuid.uuid4().hex[:8]
+    remotecis = []
+    try:
+        for i in range(args.remotecis):
+            r = remoteci.create(context, name="%s-%s" % (prefix, i), team_id=team_id)
+            if r.status_code != 201:
+                return r
+            r = remoteci.get(context, r.json()["remoteci"]["id"])
+            remotecis.append(r.json()["remoteci"])
+        stats = api_loadgen.run(
+            [_remoteci_context(context, rci) for rci in remotecis],
+            args.topic_id,
+            jobs=args.jobs,
+            interval=args.interval,
+            jitter=args.jitter,
+            log_size=args.log_size,
+            final_status=args.final_status,
+        )
+    finally:
+        for rci in remotecis:
+            remoteci.delete(context, rci["id"], etag=rci["etag"])
+    return {"calls": stats.summary()}
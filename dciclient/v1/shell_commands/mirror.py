@@ -0,0 +1,55 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.mirror import store
+from dciclient.v1 import utils
+
+
+def sync(context, args):
+    resources = args.resource.split(",") if args.resource else store.RESOURCES
+    mirror = store.Mirror(args.mirror_db)
+    try:
+        return {
+            res: "%s item(s) synced" % mirror.sync(context, res, full=args.full)
+            for res in sorted(resources)
+        }
+    finally:
+        mirror.close()
+
+
+def query(context, args):
+    return offline_list(args, args.resource)
+
+
+def offline_list(args, resource, **filters):
+    """Answer a list command from the local mirror."""
+    where = [args.where] if args.where else []
+    where += ["%s:%s" % (k, v) for k, v in sorted(filters.items())]
+    where = ",".join(where)
+    mirror = store.Mirror(args.mirror_db)
+    try:
+        items = mirror.query(
+            resource,
+            where=where,
+            sort=args.sort,
+            limit=args.limit,
+            offset=args.offset,
+        )
+        count = mirror.count(resource, where=where)
+    finally:
+        mirror.close()
+    result = {"_meta": {"count": count}, resource: items}
+    return utils.project(result, utils.parse_fields(getattr(args, "fields", None)))
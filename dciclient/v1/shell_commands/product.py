@@ -18,7 +18,9 @@ from dciclient.v1.api import product
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     return product.list(context, **params)
 
 
@@ -42,7 +44,7 @@ def delete(context, args):
 
 
 def show(context, args):
-    return product.get(context, args.id)
+    return product.get(context, args.id, fields=args.fields)
 
 
 def attach_team(context, args):
@@ -15,56 +15,39 @@
 # under the License.
 
 from dciclient.v1.api import base
+from dciclient.v1.api import purge as api_purge
 
 
 def purge(context, args):
-    resources = [
-        "components",
-        "topics",
-        "tests",
-        "teams",
-        "feeders",
-        "remotecis",
-        "jobs",
-        "files",
-        "users",
-        "products",
-    ]
-
+    resources = api_purge.RESOURCES
     l_resources = resources if args.resource is None else args.resource.split(",")
 
     wrong_resources = [res for res in l_resources if res not in resources]
-    test_auth = base.purge(context, "users", **{"force": False})
-
     if len(wrong_resources) > 0:
         msg = "Unknown resource have been specified: %s" % wrong_resources
         return msg
 
-    elif test_auth.status_code == 401:
-        return test_auth
-
+    # The number of items to be purged is retrieved for all the resources at
+    # once. This allows to present meaningful informations to the user that
+    # used this command.
+    previews = api_purge.preview(context, l_resources)
+    for r in previews.values():
+        if r.status_code == 401:
+            return r
+    previews = {res: r.json() for res, r in previews.items()}
+
+    purged = {}
+    if args.force:
+        counts = {res: p["_meta"]["count"] for res, p in previews.items()}
+        for res, (r, duration) in api_purge.purge(context, counts).items():
+            if r is None:
+                purged[res] = "skipped, a resource it depends on was not purged"
+            elif r.status_code == 204:
+                purged[res] = "%s item(s) purged in %.2fs" % (counts[res], duration)
+            else:
+                purged[res] = "not purged: %s" % base.error_message(r)
     else:
-        purged = {}
-        if args.force:
-            # If in force mode. First we retrieve the number of items to be
-            # purged and then we purge them. This allows to presents meaningful
-            # informations to the user that used this command.
-
-            for res in l_resources:
-                item_purged = base.purge(context, res, **{"force": False}).json()[
-                    "_meta"
-                ]["count"]
-                if (
-                    item_purged
-                    and base.purge(context, res, **{"force": True}).status_code == 204
-                ):
-                    purged[res] = "%s item(s) purged" % item_purged
-            return purged
-        else:
-            # If not in force mode. The various endpoints are queried for the
-            # informations about the resources to be purged and displayed.
-            for res in l_resources:
-                resource_to_delete = base.purge(context, res, **{"force": args.force})
-                if resource_to_delete.json()["_meta"]["count"] > 0:
-                    purged[res] = resource_to_delete.json()
-            return purged
+        for res, p in previews.items():
+            if p["_meta"]["count"] > 0:
+                purged[res] = p
+    return purged
@@ -20,10 +20,15 @@ from dciclient.v1.utils import validate_json
 
 from dciclient.v1.api import identity
 from dciclient.v1.api import remoteci
+from dciclient.v1.shell_commands import mirror
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    if args.offline:
+        return mirror.offline_list(args, "remotecis")
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     return remoteci.list(context, **params)
 
 
@@ -55,7 +60,7 @@ def delete(context, args):
 
 
 def show(context, args):
-    return remoteci.get(context, id=args.id)
+    return remoteci.get(context, id=args.id, fields=args.fields)
 
 
 def get_data(context, args):
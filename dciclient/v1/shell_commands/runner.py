@@ -26,6 +26,8 @@ from dciclient.v1.shell_commands import job
 from dciclient.v1.shell_commands import test
 from dciclient.v1.shell_commands import remoteci
 from dciclient.v1.shell_commands import purge
+from dciclient.v1.shell_commands import loadgen
+from dciclient.v1.shell_commands import mirror
 
 
 command_function = {
@@ -74,6 +76,7 @@ command_function = {
     "component-list-issue": component.list_issues,
     "component-update": component.update,
     "component-delete": component.delete,
+    "component-import": component.import_manifest,
     "component-file-list": component.file_list,
     "component-file-upload": component.file_upload,
     "component-file-show": component.file_show,
@@ -119,8 +122,14 @@ command_function = {
     "remoteci-reset-api-secret": remoteci.reset_api_secret,
     "remoteci-refresh-keys": remoteci.refresh_keys,
     "purge": purge.purge,
+    "loadgen": loadgen.loadgen,
+    "mirror-sync": mirror.sync,
+    "mirror-query": mirror.query,
 }
 
+# commands that don't talk to the control server
+offline_commands = ["mirror-query"]
+
 
 def run(context, args):
     return command_function[args.command](context, args)
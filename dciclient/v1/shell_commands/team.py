@@ -19,7 +19,9 @@ from dciclient.v1.api import team
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     return team.list(context, **params)
 
 
@@ -43,4 +45,4 @@ def delete(context, args):
 
 
 def show(context, args):
-    return team.get(context, args.id)
+    return team.get(context, args.id, fields=args.fields)
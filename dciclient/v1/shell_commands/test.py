@@ -20,7 +20,9 @@ from dciclient.v1.api import test
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     return test.list(context, **params)
 
 
@@ -41,4 +43,4 @@ def delete(context, args):
 
 
 def show(context, args):
-    return test.get(context, id=args.id)
+    return test.get(context, id=args.id, fields=args.fields)
@@ -15,11 +15,16 @@
 # under the License.
 
 from dciclient.v1.api import topic
+from dciclient.v1.shell_commands import mirror
 from dciclient.v1.utils import active_string
 
 
 def list(context, args):
-    params = {k: getattr(args, k) for k in ["sort", "limit", "offset", "where"]}
+    if args.offline:
+        return mirror.offline_list(args, "topics")
+    params = {
+        k: getattr(args, k) for k in ["sort", "limit", "offset", "where", "fields"]
+    }
     return topic.list(context, **params)
 
 
@@ -73,7 +78,7 @@ def delete(context, args):
 
 
 def show(context, args):
-    return topic.get(context, args.id)
+    return topic.get(context, args.id, fields=args.fields)
 
 
 def attach_team(context, args):
@@ -15,8 +15,8 @@
 # under the License.
 
 import csv
-import json
 import prettytable
+from dciclient.v1.api import codec
 from dciclient.v1.exceptions import BadParameter
 
 try:
@@ -37,7 +37,7 @@ def flatten(d, prefix=""):
 
 
 def print_json(result_json):
-    formatted_result = json.dumps(result_json, indent=4)
+    formatted_result = codec.dumps(result_json, indent=4)
     print(formatted_result)
 
 
@@ -122,13 +122,48 @@ def sanitize_kwargs(**kwargs):
             else:
                 del kwargs[k]
     try:
-        kwargs["data"] = json.loads(kwargs["data"])
+        kwargs["data"] = codec.loads(kwargs["data"])
     except (KeyError, TypeError):
         pass
 
     return kwargs
 
 
+def parse_fields(fields):
+    """Normalize a fields projection to a list of field names."""
+    if not fields:
+        return None
+    if hasattr(fields, "split"):
+        fields = fields.split(",")
+    return [f.strip() for f in fields if f.strip()]
+
+
+def project_item(item, fields):
+    """Keep only the given fields of a resource."""
+    if not isinstance(item, dict):
+        return item
+    return {k: item[k] for k in fields if k in item}
+
+
+def project(result, fields):
+    """Apply a fields projection on a decoded API response.
+
+    The `_meta` key is kept untouched, every other root key is expected to
+    be a resource or a list of resources.
+    """
+    if not fields or not isinstance(result, dict):
+        return result
+    projected = {}
+    for k, v in result.items():
+        if k == "_meta":
+            projected[k] = v
+        elif isinstance(v, list):
+            projected[k] = [project_item(i, fields) for i in v]
+        else:
+            projected[k] = project_item(v, fields)
+    return projected
+
+
 def format_output(
     result, format, headers=None, success_code=(200, 201, 204), item=None, verbose=True
 ):
@@ -166,7 +201,7 @@ def validate_json(ctx, param, value):
     if value is None:
         return
     try:
-        return json.loads(value)
+        return codec.loads(value)
     except ValueError:
         raise BadParameter("this option expects a valid JSON")
 
@@ -45,3 +45,29 @@ def test_delete_tag(dci_context, component_id):
     tag = component.add_tag(dci_context, component_id, "tag 1").json()["tag"]
     res = component.delete_tag(dci_context, component_id, tag["id"])
     assert res.status_code == 204
+
+
+def test_create_many(dci_context, topic_id):
+    components = [
+        {"name": "foo", "type": "type_1", "title": "Foo"},
+        {"name": "bar", "type": "type_1", "data": {"version": 1}},
+    ]
+    reports = component.create_many(dci_context, topic_id, components, workers=2)
+    assert [r["result"] for r in reports] == ["created", "created"]
+    assert all(r["id"] for r in reports)
+
+    components[1]["data"] = {"version": 2}
+    reports = component.create_many(dci_context, topic_id, components, workers=2)
+    assert [r["result"] for r in reports] == ["unchanged", "updated"]
+    c = component.get(dci_context, reports[1]["id"]).json()["component"]
+    assert c["data"] == {"version": 2}
+
+
+def test_create_many_reports_failures(dci_context, topic_id):
+    components = [
+        {"name": "foo", "type": "type_1", "topic_id": topic_id},
+        {"name": "bar", "type": "type_1"},
+    ]
+    reports = component.create_many(dci_context, topic_id, components)
+    assert [r["result"] for r in reports] == ["failed", "created"]
+    assert reports[0]["error"]
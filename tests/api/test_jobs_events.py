@@ -17,6 +17,8 @@
 from dciclient.v1.api import jobs_events
 from dciclient.v1.api import jobstate
 
+import pytest
+
 
 def test_jobs_events_create(dci_context, job_id):
 
@@ -59,3 +61,36 @@ def test_jobs_event_sequence(dci_context):
     je = jobs_events.get_sequence(dci_context)
     assert je.status_code == 200
     assert je.json()["sequence"]["sequence"] == 1234
+
+
+def test_jobs_events_consumer(dci_context, job_id):
+    jobstate.create(dci_context, "success", "lol", job_id)
+    seen = []
+    consumer = jobs_events.JobsEventsConsumer(dci_context, callback=seen.append)
+    assert consumer.poll() == len(seen) > 0
+
+    sequence = jobs_events.get_sequence(dci_context).json()["sequence"]
+    assert sequence["sequence"] == seen[-1]["id"]
+    assert consumer.poll() == 0
+
+
+def test_jobs_events_consumer_no_commit_on_error(dci_context, job_id):
+    jobstate.create(dci_context, "success", "lol", job_id)
+
+    def fail(events):
+        raise RuntimeError()
+
+    consumer = jobs_events.JobsEventsConsumer(dci_context, batch_callback=fail)
+    with pytest.raises(RuntimeError):
+        consumer.poll()
+    sequence = jobs_events.get_sequence(dci_context).json()["sequence"]
+    assert sequence["sequence"] == 0
+
+
+def test_jobs_events_batches(dci_context, job_id):
+    for _ in range(3):
+        jobstate.create(dci_context, "running", "lol", job_id)
+    events = list(jobs_events.iter(dci_context, 0))
+    batches = list(jobs_events.batches(dci_context, 0, limit=2))
+    assert all(len(b) <= 2 for b in batches)
+    assert [e for b in batches for e in b] == events
@@ -0,0 +1,71 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import job
+from dciclient.v1.api import loadgen
+from dciclient.v1.exceptions import CircuitOpenError
+
+import requests
+import time
+
+
+def test_percentile():
+    samples = list(range(1, 101))
+    assert loadgen.percentile(samples, 50) == 50
+    assert loadgen.percentile(samples, 99) == 99
+    assert loadgen.percentile(samples, 100) == 100
+    assert loadgen.percentile([3], 90) == 3
+    assert loadgen.percentile([], 90) is None
+
+
+def test_synthetic_log():
+    assert len(loadgen.synthetic_log(10)) == 10
+    assert len(loadgen.synthetic_log(5000)) == 5000
+
+
+def test_circuit_open_calls_are_not_samples():
+    stats = loadgen.Stats()
+    loadgen._call(stats, "job.schedule", _respond)
+    loadgen._call(stats, "job.schedule", _fail_fast)
+    (row,) = stats.summary()
+    assert row["count"] == 2
+    assert row["error_types"] == "CircuitOpenError:1"
+    assert row["p50_ms"] == row["max_ms"] >= 10
+    stats = loadgen.Stats()
+    loadgen._call(stats, "job.schedule", _fail_fast)
+    assert stats.summary()[0]["p99_ms"] is None
+
+
+def _respond():
+    time.sleep(0.01)
+    r = requests.Response()
+    r.status_code = 201
+    return r
+
+
+def _fail_fast():
+    raise CircuitOpenError("http://dci")
+
+
+def test_run(dci_context, dci_context_remoteci, job_factory, topic_id):
+    stats = loadgen.run([dci_context_remoteci] * 2, topic_id, jobs=2, log_size=100)
+    rows = dict((r["call"], r) for r in stats.summary())
+    assert rows["job.schedule"]["count"] == 4
+    assert rows["jobstate.create"]["count"] == 12
+    assert rows["file.create"]["count"] == 8
+    assert all(r["errors"] == 0 for r in rows.values())
+    statuses = [j["status"] for j in job.list(dci_context).json()["jobs"]]
+    assert statuses == ["success"] * 4
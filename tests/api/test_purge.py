@@ -0,0 +1,116 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import purge
+from dciclient.v1.shell_commands import purge as purge_commands
+from tests.shell_commands import utils
+
+import argparse
+import threading
+import time
+
+
+class PurgeServer(object):
+    """Purge endpoints of the control server, recording the purge order."""
+
+    def __init__(self, counts, statuses=None, delay=0.05):
+        self.counts = counts
+        self.statuses = statuses or {}
+        self.delay = delay
+        self.purged = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        resource = request.path_url.split("/")[-2]
+        if request.method == "GET":
+            count = self.counts.get(resource, 0)
+            return 200, {resource: [], "_meta": {"count": count}}
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+            self.purged.append(resource)
+        status_code = self.statuses.get(resource, 204)
+        if status_code == 204:
+            return 204, b""
+        return status_code, {"message": "boom"}
+
+
+def _context(server):
+    return utils.scripted_context(server)[0]
+
+
+def test_preview():
+    server = PurgeServer({"jobs": 2})
+    previews = purge.preview(_context(server), ["jobs", "files"])
+    assert previews["jobs"].json()["_meta"]["count"] == 2
+    assert previews["files"].json()["_meta"]["count"] == 0
+    assert server.purged == []
+
+
+def test_purge_dependency_order():
+    server = PurgeServer({})
+    counts = {"files": 1, "jobs": 1, "components": 1, "topics": 1, "users": 0}
+    results = purge.purge(_context(server), counts, workers=4)
+    assert sorted(results) == ["components", "files", "jobs", "topics"]
+    assert server.purged == ["files", "jobs", "components", "topics"]
+    assert all(r.status_code == 204 for r, _ in results.values())
+    assert all(duration >= 0.05 for _, duration in results.values())
+
+
+def test_purge_transitive_dependency_order():
+    server = PurgeServer({})
+    counts = {"files": 1, "jobs": 1, "remotecis": 0, "tests": 1, "products": 1}
+    purge.purge(_context(server), counts, workers=4)
+    assert server.purged.index("jobs") < server.purged.index("tests")
+    assert server.purged.index("jobs") < server.purged.index("products")
+    assert server.purged.index("files") < server.purged.index("jobs")
+
+
+def test_purge_concurrently():
+    server = PurgeServer({}, delay=0.2)
+    counts = {"files": 1, "users": 1, "feeders": 1}
+    purge.purge(_context(server), counts, workers=3)
+    assert server.max_running == 3
+
+
+def test_purge_skips_dependents_of_failures():
+    server = PurgeServer({}, statuses={"files": 500})
+    counts = {"files": 1, "jobs": 1, "components": 1, "users": 1}
+    results = purge.purge(_context(server), counts)
+    assert sorted(server.purged) == ["files", "users"]
+    assert results["files"][0].status_code == 500
+    assert results["jobs"] == (None, 0.0)
+    assert results["components"] == (None, 0.0)
+
+
+def test_purge_command_output():
+    server = PurgeServer({"files": 3, "jobs": 2}, statuses={"files": 500})
+    args = argparse.Namespace(resource="files,jobs", force=True)
+    output = purge_commands.purge(_context(server), args)
+    assert output == {
+        "files": "not purged: boom",
+        "jobs": "skipped, a resource it depends on was not purged",
+    }
+
+    server = PurgeServer({"jobs": 2})
+    output = purge_commands.purge(_context(server), args)
+    assert output["jobs"].startswith("2 item(s) purged in ")
+    assert output["jobs"].endswith("s")
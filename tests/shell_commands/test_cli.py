@@ -246,3 +246,12 @@ def test_verbose():
         ]
     )
     assert args.verbose is True
+
+
+def test_parse_arguments_timing_and_profile():
+    args = parse_arguments(["user-list"])
+    assert args.timing is False
+    assert args.profile is None
+    args = parse_arguments(["--timing", "--profile", "out.prof", "user-list"])
+    assert args.timing is True
+    assert args.profile == "out.prof"
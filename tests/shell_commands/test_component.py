@@ -16,6 +16,11 @@
 
 from __future__ import unicode_literals
 
+from dciclient.v1.exceptions import BadParameter
+from dciclient.v1.shell_commands import component as component_commands
+
+import pytest
+
 
 def test_list(runner, product_id):
     topic = runner.invoke(
@@ -264,3 +269,46 @@ def test_where_on_list(runner, product_id):
         )["_meta"]["count"]
         == 1
     )
+
+
+def test_import(runner, topic_id, tmpdir):
+    manifest = tmpdir.join("manifest.yaml")
+    manifest.write(
+        "topic_id: %s\n"
+        "components:\n"
+        "  - name: foo\n"
+        "    type: type_1\n"
+        "  - name: bar\n"
+        "    type: type_1\n"
+        "    url: http://bar\n" % topic_id
+    )
+    reports = runner.invoke(["component-import", manifest.strpath])["components"]
+    assert [r["result"] for r in reports] == ["created", "created"]
+    reports = runner.invoke(["component-import", manifest.strpath])["components"]
+    assert [r["result"] for r in reports] == ["unchanged", "unchanged"]
+
+
+def test_import_invalid_manifest(tmpdir):
+    manifest = tmpdir.join("manifest.json")
+    manifest.write('[{"name": "foo"}]')
+    with pytest.raises(BadParameter):
+        component_commands._load_manifest(manifest.strpath)
+    manifest.write('[{"name": "foo", "type": "bar"}]')
+    loaded = component_commands._load_manifest(manifest.strpath)
+    assert loaded == {"components": [{"name": "foo", "type": "bar"}]}
+
+
+def test_import_manifest_normalized(tmpdir):
+    manifest = tmpdir.join("manifest.yaml")
+    manifest.write(
+        "- name: foo\n"
+        "  type: bar\n"
+        "  released_at: 2026-01-01\n"
+        "  data: {built: [2026-01-02]}\n"
+    )
+    loaded = component_commands._load_manifest(manifest.strpath)
+    assert loaded["components"][0]["released_at"] == "2026-01-01"
+    assert loaded["components"][0]["data"] == {"built": ["2026-01-02"]}
+    manifest.write('[{"name": "foo", "type": "bar", "topic_id": "t1"}]')
+    with pytest.raises(BadParameter):
+        component_commands._load_manifest(manifest.strpath)
@@ -15,6 +15,7 @@
 # under the License.
 
 from dciclient.v1.api import job
+from dciclient.v1.api import jobstate
 
 import pytest
 import requests
@@ -159,9 +160,17 @@ def test_unattach_issue(runner, job_id):
     assert count == 0
 
 
-def test_job_output(runner, job_id):
-    result = runner.invoke_raw(["job-output", job_id])
-    assert result[0].startswith("pre-run")
+def test_job_output(capsys, runner, job_id):
+    runner.invoke_raw(["job-output", job_id])
+    captured = capsys.readouterr()
+    assert captured.out.startswith("pre-run")
+
+
+def test_job_output_follow(capsys, runner, dci_context, job_id):
+    jobstate.create(dci_context, "success", "done", job_id)
+    runner.invoke_raw(["job-output", job_id, "--follow", "--poll-interval", "0"])
+    captured = capsys.readouterr()
+    assert captured.out.startswith("pre-run")
 
 
 def test_tags(runner, job_id):
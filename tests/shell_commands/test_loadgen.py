@@ -0,0 +1,45 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.shell_commands import loadgen as loadgen_commands
+
+
+def test_loadgen(runner, job_factory, topic_id, team_user_id):
+    result = runner.invoke_raw(
+        [
+            "loadgen",
+            "--topic-id",
+            topic_id,
+            "--team-id",
+            team_user_id,
+            "--remotecis",
+            "3",
+            "--jobs",
+            "2",
+            "--interval",
+            "0.01",
+        ]
+    )
+    rows = dict((r["call"], r) for r in result["calls"])
+    assert rows["job.schedule"]["count"] == 6
+    assert rows["job.schedule"]["errors"] == 0
+
+
+def test_remoteci_context_has_no_circuit_breaker(dci_context):
+    rci = {"id": "rci", "api_secret": "secret"}
+    c = loadgen_commands._remoteci_context(dci_context, rci)
+    assert c.session.circuit_breakers is None
+    assert dci_context.session.circuit_breakers is not None
@@ -26,6 +26,18 @@ def test_list(runner):
     assert (current_nb_teams + 2) == len(teams)
 
 
+def test_list_fields(runner):
+    runner.invoke(["team-create", "--name", "foo"])
+    teams = runner.invoke(["team-list", "--fields", "id,name"])["teams"]
+    assert sorted(teams[0].keys()) == ["id", "name"]
+
+
+def test_show_fields(runner):
+    team = runner.invoke(["team-create", "--name", "foo"])["team"]
+    team = runner.invoke(["team-show", team["id"], "--fields", "name"])["team"]
+    assert team == {"name": "foo"}
+
+
 def test_create(runner, team_admin_id):
     team = runner.invoke(["team-create", "--name", "foo"])["team"]
     assert team["name"] == "foo"
@@ -23,3 +23,13 @@ class TestUtils(object):
         r = utils.flatten(s)
         r.sort()
         assert r == ["a.b.c.d=bob", "jim=123", "rob=34"]
+
+    def test_project(self):
+        r = {
+            "_meta": {"count": 1},
+            "teams": [{"id": "1", "name": "foo", "etag": "a", "data": {}}],
+        }
+        assert utils.project(r, utils.parse_fields("id,name")) == {
+            "_meta": {"count": 1},
+            "teams": [{"id": "1", "name": "foo"}],
+        }
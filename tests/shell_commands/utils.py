@@ -15,12 +15,15 @@
 # under the License.
 
 import io
+import json
 import requests.adapters
 import requests.models
 import requests.utils
+import threading
 
 from dci import auth
 from dci.db import models
+from dciclient.v1.api import context as api_context
 
 
 class FlaskHTTPAdapter(requests.adapters.HTTPAdapter):
@@ -68,6 +71,66 @@ class FlaskHTTPAdapter(requests.adapters.HTTPAdapter):
         return self.build_response(request, response)
 
 
+class ScriptedAdapter(requests.adapters.BaseAdapter):
+    """Answer the requests from a script instead of a server.
+
+    The script is a list of outcomes, one per request, or a function of the
+    request returning its outcome. An outcome is an exception to raise, a
+    status code or a (status code, body, headers) tuple, the body is JSON
+    encoded unless it's bytes. The requests, their bodies and timeouts are
+    recorded.
+    """
+
+    def __init__(self, script):
+        super(ScriptedAdapter, self).__init__()
+        self.script = script if callable(script) else list(script)
+        self.requests = []
+        self.bodies = []
+        self.timeouts = []
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        body = request.body
+        with self.lock:
+            self.requests.append(request)
+            self.bodies.append(body.read() if hasattr(body, "read") else body)
+            self.timeouts.append(kwargs.get("timeout"))
+            if not callable(self.script):
+                outcome = self.script.pop(0)
+        if callable(self.script):
+            outcome = self.script(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if not isinstance(outcome, tuple):
+            outcome = (outcome,)
+        status_code, body, headers = (outcome + ({}, {}))[:3]
+        response = requests.models.Response()
+        response.status_code = status_code
+        response.headers.update(headers)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        response._content = body
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def scripted_context(script, **kwargs):
+    """Return a context on http://dci answered by a ScriptedAdapter.
+
+    The retries don't sleep, the delays are recorded in context.slept.
+    """
+    context = api_context.DciContext("http://dci", "admin", "admin", **kwargs)
+    context.slept = []
+    context.session.retry_policy.sleep = context.slept.append
+    adapter = ScriptedAdapter(script)
+    context.session.mount("http://dci", adapter)
+    return context, adapter
+
+
 def generate_componenttype(client):
     return client.post("/componenttypes", {"name": "my_component_type"}).json()
 
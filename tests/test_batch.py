@@ -0,0 +1,119 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import batch
+from dciclient.v1.api import codec
+from tests.shell_commands import utils
+
+import threading
+
+
+class ComponentsServer(object):
+    """In-memory components, the PUTs are checked against their etag."""
+
+    def __init__(self, components):
+        self.components = dict((c["id"], dict(c)) for c in components)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        id = request.path_url.split("?")[0].split("/")[-1]
+        with self.lock:
+            self.calls.append((request.method, id))
+            component = self.components.get(id)
+            if component is None:
+                return 404, {"message": "not found"}
+            if request.method == "GET":
+                return 200, {"component": dict(component)}
+            if request.headers["If-match"] != component["etag"]:
+                return 412, {"message": "etag mismatch"}
+            component.update(codec.loads(request.body))
+            component["etag"] = "%s+" % component["etag"]
+            return 200, {"component": dict(component)}
+
+
+def _context(components):
+    server = ComponentsServer(components)
+    return utils.scripted_context(server)[0], server
+
+
+COMPONENTS = [
+    {"id": "a", "etag": "1", "state": "active", "name": "old"},
+    {"id": "b", "etag": "1", "state": "active", "name": "new"},
+    {"id": "c", "etag": "1", "state": "inactive", "name": "old"},
+]
+
+
+def test_update():
+    c, server = _context(COMPONENTS)
+
+    def deactivate(component):
+        if component["name"] == "old":
+            return {"state": "inactive"}
+
+    reports = batch.update(c, "components", COMPONENTS, deactivate)
+    assert [(r["id"], r["result"]) for r in reports] == [
+        ("a", "updated"),
+        ("b", "unchanged"),
+        ("c", "unchanged"),
+    ]
+    assert server.calls == [("PUT", "a")]
+    assert server.components["a"]["state"] == "inactive"
+
+
+def test_update_merges_on_conflict():
+    c, server = _context(COMPONENTS)
+    # changed by someone else since the listing
+    server.components["a"].update(etag="2", tags=["x"])
+
+    def add_tag(component):
+        return {"tags": component.get("tags", []) + ["y"]}
+
+    reports = batch.update(c, "components", COMPONENTS[:1], add_tag)
+    assert reports[0]["result"] == "updated"
+    assert reports[0]["attempts"] == 2
+    assert server.calls == [("PUT", "a"), ("GET", "a"), ("PUT", "a")]
+    assert server.components["a"]["tags"] == ["x", "y"]
+
+
+def test_update_gives_up(monkeypatch):
+    c, server = _context(COMPONENTS)
+    server.components["a"]["etag"] = "2"
+    stale = dict(COMPONENTS[0])
+    monkeypatch.setattr(batch, "_fetch", lambda context, resource, id: (stale, None))
+    reports = batch.update(
+        c, "components", [stale], lambda i: {"name": "x"}, max_attempts=2
+    )
+    assert reports[0]["result"] == "failed"
+    assert reports[0]["error"] == "etag mismatch"
+    assert reports[0]["attempts"] == 2
+
+
+def test_update_ids():
+    c, server = _context(COMPONENTS)
+    reports = batch.update_ids(
+        c,
+        "components",
+        {"c": {"state": "active"}, "a": {"state": "active"}, "z": {"state": "x"}},
+        items=COMPONENTS[2:],
+    )
+    assert [(r["id"], r["result"]) for r in reports] == [
+        ("c", "updated"),
+        ("a", "unchanged"),
+        ("z", "failed"),
+    ]
+    assert reports[2]["error"] == "not found"
+    assert sorted(server.calls) == [("GET", "a"), ("GET", "z"), ("PUT", "c")]
@@ -0,0 +1,49 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from benchmarks import suite
+
+
+def _run(**values):
+    return {
+        "results": dict(
+            (name, suite._result(value, "ms", name.endswith("_rate")))
+            for name, value in values.items()
+        )
+    }
+
+
+def test_compare():
+    old = _run(latency=10.0, throughput_rate=100.0, removed=1.0)
+    lines, regressed = suite.compare(old, _run(latency=10.5, throughput_rate=120.0))
+    assert not regressed
+    assert "removed                          only in one run" in lines
+
+    lines, regressed = suite.compare(old, _run(latency=12.0, throughput_rate=100.0))
+    assert regressed
+    assert [line for line in lines if "REGRESSION" in line][0].startswith("latency")
+
+    lines, regressed = suite.compare(old, _run(latency=10.0, throughput_rate=80.0))
+    assert regressed
+
+
+def test_run_format_output():
+    results = suite.format_output(None, quick=True)
+    assert sorted(results) == [
+        "format_output_csv",
+        "format_output_json",
+        "format_output_table",
+    ]
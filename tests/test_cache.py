@@ -0,0 +1,118 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import cache
+from dciclient.v1.api import context as api_context
+from dciclient.v1.api import topic
+from tests.shell_commands import utils
+
+import json
+import pytest
+
+
+@pytest.fixture(params=["memory", "disk"])
+def dci_context_cache(request, server, db_provisioning, tmpdir):
+    if request.param == "memory":
+        c = cache.MemoryCache(ttl=300, max_size=2)
+    else:
+        c = cache.DiskCache(tmpdir.strpath, ttl=300, max_size=2)
+    url = "http://dciserver.com"
+    context = api_context.DciContext(url, "admin", "admin", cache=c)
+    context.session.mount(url, utils.FlaskHTTPAdapter(server.test_client()))
+    return context
+
+
+def test_cache_hit(dci_context_cache, topic_id):
+    t1 = topic.get(dci_context_cache, topic_id)
+    t2 = topic.get(dci_context_cache, topic_id)
+    assert t1.json() == t2.json()
+    assert getattr(t2, "from_cache", False)
+    assert dci_context_cache.session.cache.hits == 1
+
+
+def test_cache_revalidation(dci_context_cache, topic_id):
+    topic.get(dci_context_cache, topic_id)
+    dci_context_cache.session.cache.ttl = 0
+    t = topic.get(dci_context_cache, topic_id)
+    assert t.status_code == 200
+    assert t.json()["topic"]["id"] == topic_id
+
+
+def test_cache_invalidated_on_update(dci_context_cache, topic_id):
+    t = topic.get(dci_context_cache, topic_id).json()["topic"]
+    topic.update(dci_context_cache, id=topic_id, etag=t["etag"], name="new_name")
+    t = topic.get(dci_context_cache, topic_id)
+    assert not getattr(t, "from_cache", False)
+    assert t.json()["topic"]["name"] == "new_name"
+
+
+def test_memory_cache_lru():
+    c = cache.MemoryCache(max_size=2)
+    c.set("a", {"url": "a"})
+    c.set("b", {"url": "b"})
+    c.get("a")
+    c.set("c", {"url": "c"})
+    assert c.get("b") is None
+    assert c.get("a") is not None
+    assert c.get("c") is not None
+
+
+def _revalidating(request):
+    """Answer 304 to the requests with the current etag."""
+    if request.method != "GET":
+        return 201
+    if request.headers.get("If-None-Match") == '"v1"':
+        return 304, b""
+    return 200, {"topic": {"id": "1"}}, {"ETag": '"v1"'}
+
+
+@pytest.mark.parametrize("disk", [False, True])
+def test_cache_revalidation_304(disk, tmpdir):
+    if disk:
+        c = cache.DiskCache(tmpdir.strpath, ttl=0)
+    else:
+        c = cache.MemoryCache(ttl=0)
+    context, adapter = utils.scripted_context(_revalidating, cache=c)
+    context.session.get("http://dci/api/v1/topics/1")
+    r = context.session.get("http://dci/api/v1/topics/1")
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+    assert c.revalidations == 1
+    assert r.status_code == 200
+    assert r.from_cache
+    assert r.json() == {"topic": {"id": "1"}}
+
+
+def test_write_invalidates_other_resources():
+    c = cache.MemoryCache(ttl=300)
+    context, adapter = utils.scripted_context(_revalidating, cache=c)
+    context.session.get("http://dci/api/v1/topics/1/components")
+    context.session.post("http://dci/api/v1/components", json={})
+    context.session.get("http://dci/api/v1/topics/1/components")
+    assert c.hits == 0
+    assert len(adapter.requests) == 3
+
+
+def test_disk_cache_stores_json(tmpdir):
+    c = cache.DiskCache(tmpdir.strpath)
+    entry = {"url": "http://dci/a", "content": b"\x00\xff", "stored_at": 1}
+    c.set("a", entry)
+    (path,) = tmpdir.listdir()
+    assert json.loads(path.read())["url"] == "http://dci/a"
+    assert c.get("a") == entry
+    path.write("not json")
+    assert c.get("a") is None
+    c.invalidate()
+    assert tmpdir.listdir() == []
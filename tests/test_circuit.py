@@ -0,0 +1,152 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import circuit
+from dciclient.v1.api import metrics
+from dciclient.v1.exceptions import CircuitOpenError
+from tests.shell_commands import utils
+
+import pytest
+import requests
+
+
+def _context(outcomes, max_retries=0, **settings):
+    c, adapter = utils.scripted_context(outcomes, max_retries=max_retries)
+    c.session.circuit_breakers = circuit.CircuitBreakers(
+        listener=c.instrumentation.circuit_changed, **settings
+    )
+    return c, adapter
+
+
+def _open(breaker):
+    for _ in range(breaker.minimum_requests):
+        breaker.before()
+        breaker.record(failed=True)
+
+
+def test_opens_on_failure_rate():
+    breaker = circuit.CircuitBreaker("dci", minimum_requests=4, failure_threshold=0.5)
+    for failed in [False, False, True]:
+        breaker.before()
+        breaker.record(failed)
+    assert breaker.state == circuit.CLOSED
+    breaker.before()
+    breaker.record(True)
+    assert breaker.state == circuit.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+
+
+def test_old_outcomes_expire():
+    breaker = circuit.CircuitBreaker("dci", minimum_requests=2, window=60)
+    breaker.record(True)
+    breaker._outcomes[0] = (breaker._outcomes[0][0] - 120, True)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == circuit.CLOSED
+    assert len(breaker._outcomes) == 2
+
+
+def test_half_open_probes():
+    breaker = circuit.CircuitBreaker("dci", minimum_requests=2, reset_timeout=30)
+    _open(breaker)
+    breaker.opened_at -= 31
+    breaker.before()
+    assert breaker.state == circuit.HALF_OPEN
+    # a single probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+    breaker.record(failed=True)
+    assert breaker.state == circuit.OPEN
+
+    breaker.opened_at -= 31
+    breaker.before()
+    breaker.record(failed=False)
+    assert breaker.state == circuit.CLOSED
+    breaker.before()
+
+
+def test_session_fails_fast():
+    c, adapter = _context([503] * 3, minimum_requests=3)
+    for _ in range(3):
+        assert c.session.get("http://dci/api/v1/jobs").status_code == 503
+    with pytest.raises(CircuitOpenError):
+        c.session.get("http://dci/api/v1/jobs")
+    assert adapter.script == []
+    assert c.instrumentation.circuits == {"dci": circuit.OPEN}
+
+
+def test_circuit_open_error_is_a_connection_error():
+    c, adapter = _context(
+        [requests.exceptions.ConnectionError("down")] * 2, minimum_requests=2
+    )
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            c.session.get("http://dci/api/v1/jobs")
+    with pytest.raises(requests.exceptions.ConnectionError) as e:
+        c.session.get("http://dci/api/v1/jobs")
+    assert isinstance(e.value, CircuitOpenError)
+    assert adapter.script == []
+
+
+def test_retries_count_once():
+    # a single bad endpoint doesn't trip the circuit of the host
+    c, adapter = _context([502] * 11 + [200], max_retries=10)
+    r = c.session.get("http://dci/api/v1/jobs/1")
+    assert r.status_code == 502
+    assert r.retries == 10
+    assert c.session.circuit_breakers.states() == {"dci": circuit.CLOSED}
+    assert c.session.get("http://dci/api/v1/jobs").status_code == 200
+
+
+def test_retries_stop_when_circuit_opens():
+    c, adapter = _context([502] * 3, max_retries=5, minimum_requests=2)
+    breaker = c.session.circuit_breakers.get("http://dci")
+    # opened by the requests of another thread meanwhile
+    c.session.retry_policy.sleep = lambda seconds: _open(breaker)
+    r = c.session.get("http://dci/api/v1/jobs")
+    assert r.status_code == 502
+    assert len(adapter.bodies) == 1
+
+
+def test_cancelled_probe():
+    breaker = circuit.CircuitBreaker("dci", minimum_requests=2)
+    _open(breaker)
+    breaker.opened_at -= breaker.reset_timeout + 1
+    breaker.before()
+    breaker.cancel()
+    breaker.before()
+    assert breaker.state == circuit.HALF_OPEN
+
+
+def test_client_errors_are_successes():
+    c, adapter = _context([404] * 5, minimum_requests=2)
+    for _ in range(5):
+        c.session.get("http://dci/api/v1/jobs/1")
+    assert c.session.circuit_breakers.states() == {"dci": circuit.CLOSED}
+
+
+def test_circuit_hooks_and_metrics():
+    c, adapter = _context([500, 500], minimum_requests=2)
+    m = metrics.Metrics().attach(c)
+    events = []
+    c.instrumentation.add_circuit_hook(events.append)
+    c.session.get("http://dci/api/v1/jobs")
+    c.session.get("http://dci/api/v1/jobs")
+    assert events == [{"host": "dci", "state": circuit.OPEN}]
+    text = m.render()
+    assert 'dci_client_circuit_state{host="dci",state="open"} 1' in text
+    assert 'dci_client_circuit_state{host="dci",state="closed"} 0' in text
@@ -0,0 +1,55 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import codec
+from dciclient.v1.api import job
+
+import json
+import pytest
+
+
+@pytest.fixture(params=codec.BACKENDS)
+def backend(request):
+    try:
+        codec.set_backend(request.param)
+    except ImportError:
+        pytest.skip("%s is not installed" % request.param)
+    yield request.param
+    codec.set_backend()
+
+
+def test_codec(backend):
+    doc = {"name": u"café", "tags": ["a/b"], "data": {"n": 2 ** 40, "x": None}}
+    assert codec.loads(codec.dumps(doc)) == doc
+    assert codec.loads(codec.dumps(doc).encode("utf-8")) == doc
+    assert codec.dumps(doc, indent=4) == json.dumps(doc, indent=4)
+    assert codec.loads(codec.dumps({1: "a"})) == {"1": "a"}
+    with pytest.raises(ValueError):
+        codec.loads("{")
+    with pytest.raises(TypeError):
+        codec.loads({})
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        codec.set_backend("foo")
+
+
+def test_codec_requests(backend, dci_context, job_id):
+    etag = job.get(dci_context, job_id).json()["job"]["etag"]
+    r = job.update(dci_context, id=job_id, etag=etag, comment=u"café")
+    assert r.status_code == 200
+    assert job.get(dci_context, job_id).json()["job"]["comment"] == u"café"
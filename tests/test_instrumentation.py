@@ -0,0 +1,80 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import cache
+from dciclient.v1.api import instrumentation
+from dciclient.v1.api import job
+
+ID = "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+
+
+def test_endpoint():
+    root = "https://api.distributed-ci.io/api/v1"
+    assert instrumentation.endpoint("%s/jobs" % root, root) == "/jobs"
+    assert (
+        instrumentation.endpoint("%s/jobs/%s/files?limit=1" % (root, ID), root)
+        == "/jobs/<id>/files"
+    )
+    assert instrumentation.endpoint("%s/jobs_events/12" % root, root) == (
+        "/jobs_events/<id>"
+    )
+    assert instrumentation.endpoint("https://sso/auth/token") == "/auth/token"
+
+
+def test_histogram():
+    h = instrumentation.Histogram(buckets=(0.1, 1))
+    for latency, status in [(0.05, 200), (0.5, 200), (0.6, 500), (3, 200)]:
+        h.observe(
+            {
+                "latency": latency,
+                "status": status,
+                "error": None,
+                "bytes_in": 10,
+                "bytes_out": 0,
+            }
+        )
+    assert h.counts == [1, 2, 1]
+    assert h.count == 4
+    assert h.errors == 1
+    assert h.bytes_in == 40
+    assert h.percentile(25) == 0.1
+    assert h.percentile(50) == 1
+    assert h.percentile(100) == 3
+
+
+def test_request_hooks(dci_context, job_id):
+    pre = []
+    post = []
+    dci_context.instrumentation.add_pre_request_hook(pre.append)
+    dci_context.instrumentation.add_post_request_hook(post.append)
+    dci_context.session.cache = cache.MemoryCache()
+    job.get(dci_context, job_id)
+    job.get(dci_context, job_id)
+    job.list(dci_context)
+
+    assert [e["endpoint"] for e in pre] == ["/jobs/<id>", "/jobs/<id>", "/jobs"]
+    assert post == pre
+    assert post[0]["status"] == 200
+    assert post[0]["bytes_in"] > 0
+    assert post[0]["latency"] >= post[0]["ttfb"] >= 0
+    assert [e["cached"] for e in post] == [False, True, False]
+
+    stats = dict(
+        ((s["method"], s["endpoint"]), s)
+        for s in dci_context.instrumentation.summary()
+    )
+    assert stats[("GET", "/jobs/<id>")]["count"] == 2
+    assert stats[("GET", "/jobs")]["count"] == 1
@@ -16,8 +16,13 @@
 
 from dciclient.v1.api import component
 from dciclient.v1.api import job
+from dciclient.v1.api import jobstate
 from dciclient.v1.api import topic
 
+from mock import Mock
+from mock import patch
+import threading
+
 
 def test_job_create_as_remoteci(
     dci_context, dci_context_remoteci, components_ids, topic_id, team_user_id, job_id
@@ -60,3 +65,31 @@ def test_job_upgraded(dci_context, job_id, topic_id, product_id):
     r = job.upgrade(dci_context, job_id=job_id)
     assert r.status_code == 201
     assert r.json()["job"]["previous_job_id"] == job_id
+
+
+def test_follow_output_ends_on_any_final_status(dci_context, job_id):
+    jobstate.create(dci_context, "running", "starting", job_id)
+    jobstate.create(dci_context, "product-failure", "broken product", job_id)
+    output = []
+
+    def _follow():
+        output.extend(job.follow_output(dci_context, job_id, poll_interval=0))
+
+    follow = threading.Thread(target=_follow)
+    follow.daemon = True
+    follow.start()
+    follow.join(30)
+    assert not follow.is_alive()
+    assert output == ["pre-run ongoing"]
+
+
+def test_follow_output_lists_a_file_once():
+    f = {"id": "f1", "created_at": "2026-01-01", "jobstate_id": "js1"}
+    jobstates = Mock()
+    jobstates.json.return_value = {"jobstates": [{"status": "success"}]}
+    content = Mock(text="output")
+    with patch.object(job, "list_jobstates", return_value=jobstates):
+        # a file created during the listing repeats f on the next page
+        with patch.object(job, "list_files_iter", return_value=[f, f]):
+            with patch.object(job.dci_file, "content", return_value=content):
+                assert list(job.follow_output(None, "j1", workers=1)) == ["output"]
@@ -0,0 +1,73 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import job
+from dciclient.v1.api import jsonstream
+
+import json
+import pytest
+
+
+def _chunks(s, size):
+    return [s[i:][:size] for i in range(0, len(s), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 100000])
+def test_iter_items(size):
+    doc = {
+        "_meta": {"count": 2, "weird": ["]}", {"jobs": []}]},
+        "jobs": [
+            {"id": 1, "name": u"café \"]}", "duration": 1234567},
+            {"id": 2, "tags": [True, None, 1.5e3]},
+        ],
+        "after": 42,
+    }
+    body = json.dumps(doc, indent=2).encode("utf-8")
+    items = list(jsonstream.iter_items(_chunks(body, size), "jobs"))
+    assert items == doc["jobs"]
+
+
+def test_iter_items_edge_cases():
+    assert list(jsonstream.iter_items([b"{}"], "jobs")) == []
+    assert list(jsonstream.iter_items([b'{"jobs": [ ] }'], "jobs")) == []
+    assert list(jsonstream.iter_items([b'{"jobs":[1,2', b"3]}"], "jobs")) == [1, 23]
+    with pytest.raises(ValueError):
+        list(jsonstream.iter_items([b'{"jobs":[1,'], "jobs"))
+
+
+class CountingDecoder(object):
+    def __init__(self):
+        self.calls = 0
+
+    def raw_decode(self, s, idx=0):
+        self.calls += 1
+        return json.JSONDecoder().raw_decode(s, idx)
+
+
+def test_large_item_parsed_a_few_times(monkeypatch):
+    decoder = CountingDecoder()
+    monkeypatch.setattr(jsonstream, "_DECODER", decoder)
+    doc = {"jobs": [{"id": 1, "data": "x" * 100000}, {"id": 2}]}
+    body = json.dumps(doc).encode("utf-8")
+    items = list(jsonstream.iter_items(_chunks(body, 100), "jobs"))
+    assert items == doc["jobs"]
+    assert decoder.calls < 40
+
+
+def test_iter_stream(dci_context, job_id):
+    jobs = list(job.iter(dci_context, embed="topic,remoteci", limit=1))
+    assert list(job.iter(dci_context, embed="topic,remoteci", stream=True)) == jobs
+    assert jobs[0]["id"] == job_id
@@ -14,10 +14,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from dciclient.v1.api import identity
 from dciclient.v1.api import job
 from dciclient import version
 
 import mock
+import threading
+import time
 
 
 def test_standard_headers(job_id, dci_context):
@@ -41,3 +44,41 @@ def test_ua_headers(job_id, dci_context_other_user_agent):
         assert prepared_request[0].headers["Client-Version"] == (
             "python-dciclient_%s" % version.__version__
         )
+
+
+def test_coalesce_concurrent_gets(job_id, dci_context):
+    send = dci_context.session.send
+    started = threading.Event()
+
+    def slow_send(*args, **kwargs):
+        started.wait(5)
+        return send(*args, **kwargs)
+
+    results = []
+
+    def get():
+        results.append(job.get(dci_context, job_id).json()["job"]["id"])
+
+    with mock.patch.object(dci_context.session, "send", side_effect=slow_send) as m:
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        for t in threads:
+            t.start()
+        while dci_context.session.coalesced_requests < 3:
+            time.sleep(0.01)
+        started.set()
+        for t in threads:
+            t.join()
+        assert m.call_count == 1
+    assert results == [job_id] * 4
+
+
+def test_identity_is_memoized(dci_context, team_admin_id):
+    with mock.patch.object(
+        dci_context.session, "send", wraps=dci_context.session.send
+    ) as m:
+        assert identity.my_team_id(dci_context) == team_admin_id
+        assert identity.my_team_id(dci_context) == team_admin_id
+        assert m.call_count == 1
+        dci_context.invalidate_identity()
+        assert dci_context.identity["team_id"] == team_admin_id
+        assert m.call_count == 2
@@ -16,6 +16,7 @@
 
 from dciclient.shell import main
 from mock import patch
+import pstats
 import sys
 
 
@@ -39,3 +40,30 @@ def test_build_valid_remoteci_context(
     assert mock_run.called
     assert mock_run.call_args_list[0][0][0] is not None
     assert mock_printer.called
+
+
+@patch("dciclient.shell.print_response")
+@patch("dciclient.shell.run")
+def test_timing_and_profile(
+    mock_run, mock_printer, remoteci_id, remoteci_api_secret, capsys, tmpdir
+):
+    profile = str(tmpdir.join("dcictl.prof"))
+    test_args = [
+        "dcictl",
+        "--dci-client-id",
+        remoteci_id,
+        "--dci-api-secret",
+        remoteci_api_secret,
+        "--timing",
+        "--profile",
+        profile,
+        "component-list",
+        "--topic-id",
+        "id",
+    ]
+    with patch.object(sys, "argv", test_args):
+        main()
+    err = capsys.readouterr().err
+    for phase in ["imports", "argument parsing", "command", "http requests"]:
+        assert phase in err
+    assert pstats.Stats(profile).total_calls > 0
@@ -0,0 +1,93 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import job
+from dciclient.v1.api import metrics
+
+import os
+import requests
+
+
+def _event(endpoint, status, latency, method="GET"):
+    return {
+        "method": method,
+        "endpoint": endpoint,
+        "status": status,
+        "error": None,
+        "latency": latency,
+        "bytes_in": 100,
+        "bytes_out": 0,
+    }
+
+
+def _metrics():
+    m = metrics.Metrics(buckets=(0.1, 1))
+    m.observe(_event("/jobs", 200, 0.05))
+    m.observe(_event("/jobs/<id>/files", 200, 0.5))
+    m.observe(_event("/jobs/<id>", 500, 2))
+    m.observe(_event("/files/<id>/content", None, 0.2))
+    return m
+
+
+def test_resource_type():
+    assert metrics.resource_type("/jobs/<id>/files") == "jobs"
+    assert metrics.resource_type("/") == "root"
+
+
+def test_render():
+    lines = _metrics().render().splitlines()
+    requests_total = 'dci_client_requests_total{code="%s",method="GET",resource="%s"}'
+    assert requests_total % ("200", "jobs") + " 2" in lines
+    assert requests_total % ("error", "files") + " 1" in lines
+    assert 'dci_client_request_errors_total{method="GET",resource="jobs"} 1' in lines
+    assert 'dci_client_received_bytes_total{method="GET",resource="jobs"} 300' in lines
+    for le, count in [("0.1", 1), ("1", 2), ("+Inf", 3)]:
+        assert (
+            'dci_client_request_duration_seconds_bucket{le="%s",method="GET",'
+            'resource="jobs"} %d' % (le, count)
+        ) in lines
+    assert (
+        'dci_client_request_duration_seconds_count{method="GET",resource="jobs"} 3'
+    ) in lines
+
+
+def test_write_textfile(tmpdir):
+    path = str(tmpdir.join("dci.prom"))
+    m = _metrics()
+    m.write_textfile(path)
+    m.write_textfile(path)
+    assert os.listdir(str(tmpdir)) == ["dci.prom"]
+    with open(path) as f:
+        assert "dci_client_requests_total" in f.read()
+
+
+def test_serve():
+    server = metrics.Metrics().serve(port=0)
+    try:
+        url = "http://127.0.0.1:%s" % server.server_address[1]
+        r = requests.get(url + "/metrics")
+        assert r.status_code == 200
+        assert "dci_client_metrics_timestamp_seconds" in r.text
+        assert requests.get(url + "/foo").status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_attach(dci_context, job_id):
+    m = metrics.Metrics().attach(dci_context)
+    job.get(dci_context, job_id)
+    assert m.requests == {("jobs", "GET", "200"): 1}
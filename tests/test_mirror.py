@@ -0,0 +1,120 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.mirror import query
+from dciclient.mirror import store
+from dciclient.v1.api import topic
+
+import pytest
+
+
+@pytest.fixture
+def mirror(tmpdir):
+    m = store.Mirror(tmpdir.join("mirror.db").strpath)
+    yield m
+    m.close()
+
+
+def test_sync_and_query(dci_context, mirror, topic_id, product_id):
+    assert mirror.sync(dci_context, "topics") == 1
+    topics = mirror.query("topics", where="product_id:%s" % product_id)
+    assert [t["id"] for t in topics] == [topic_id]
+
+
+def test_incremental_sync(dci_context, mirror, topic_id):
+    mirror.sync(dci_context, "topics")
+    t = topic.get(dci_context, topic_id).json()["topic"]
+    topic.update(dci_context, id=topic_id, etag=t["etag"], name="new_name")
+    mirror.sync(dci_context, "topics")
+    assert mirror.query("topics", where="name:new_name")[0]["id"] == topic_id
+    assert len(mirror.query("topics")) == 1
+
+
+def test_mirror_commands(runner, tmpdir, topic_id):
+    db = tmpdir.join("mirror.db").strpath
+    synced = runner.invoke_raw(
+        ["mirror-sync", "--resource", "topics", "--mirror-db", db]
+    )
+    assert synced == {"topics": "1 item(s) synced"}
+    result = runner.invoke_raw(["mirror-query", "topics", "--mirror-db", db])
+    assert result["topics"][0]["id"] == topic_id
+
+
+def test_offline_list(runner, tmpdir, topic_id):
+    db = tmpdir.join("mirror.db").strpath
+    runner.invoke_raw(["mirror-sync", "--resource", "topics", "--mirror-db", db])
+    online = runner.invoke(["topic-list"])
+    offline = runner.invoke_raw(["topic-list", "--offline", "--mirror-db", db])
+    assert offline["topics"] == online["topics"]
+    assert offline["_meta"]["count"] == 1
+
+
+ITEMS = [
+    {
+        "id": "1",
+        "name": "foo",
+        "type": "type_1",
+        "state": "active",
+        "topic": {"name": "osp"},
+        "export_control": True,
+        "data": {"n": 1, "tags": ["a", "b"]},
+    },
+    {
+        "id": "2",
+        "name": "bar",
+        "type": "typeX1",
+        "state": "archived",
+        "topic": None,
+        "export_control": False,
+        "data": {"n": 2.5},
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "where,expected",
+    [
+        ("state:active", ["1"]),
+        ("state:!active", ["2"]),
+        ("name:F*", ["1"]),
+        ("topic.name:osp", ["1"]),
+        ("topic:null", ["2"]),
+        ("state:active,name:bar", []),
+        ("export_control:true", ["1"]),
+        ("export_control:false", ["2"]),
+        ("data.n:1", ["1"]),
+        ("data.n:2.5", ["2"]),
+        ("data.n:!1", ["2"]),
+        ("data.tags:[\"a\"*", ["1"]),
+        ("topic.name:!osp", ["2"]),
+        ("data.tags:!null", ["1"]),
+        ("type:type_*", ["1"]),
+        ("type:%*", []),
+        ("type:type\\*", []),
+    ],
+)
+def test_where(mirror, where, expected):
+    memory = query.MemoryStore(ITEMS, indexes=["id", "state"])
+    assert [i["id"] for i in memory.query(where, sort="id")] == expected
+    items = [dict(i, created_at="", updated_at="") for i in ITEMS]
+    mirror._upsert("topics", items)
+    assert [i["id"] for i in mirror.query("topics", where, sort="id")] == expected
+
+
+def test_sort_limit_offset():
+    memory = query.MemoryStore(ITEMS)
+    assert [i["id"] for i in memory.query(sort="-name")] == ["1", "2"]
+    assert [i["id"] for i in memory.query(sort="name", limit=1, offset=1)] == ["1"]
@@ -0,0 +1,51 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import job
+from dciclient.v1.api import models
+
+import pytest
+
+
+def test_model_from_dict():
+    d = {
+        "id": "1",
+        "name": "foo",
+        "status": "success",
+        "data": {"a": [1, 2]},
+        "topic": {"name": "bar"},
+    }
+    j = models.Job.from_dict(d)
+    assert j.id == "1"
+    assert j.status == "success"
+    assert j.comment is None
+    assert j.data == {"a": [1, 2]}
+    assert j.topic == {"name": "bar"}
+    assert not hasattr(j, "__dict__")
+    with pytest.raises(AttributeError):
+        j.unknown
+    assert j.to_dict()["data"] == {"a": [1, 2]}
+    assert j.to_dict()["topic"] == {"name": "bar"}
+    assert models.Job.from_dict(j.to_dict()) == j
+
+
+def test_iter_models(dci_context, job_id):
+    jobs = list(job.iter_models(dci_context))
+    assert [j.id for j in jobs] == [job_id]
+    assert isinstance(jobs[0], models.Job)
+    assert jobs[0].etag == job.get(dci_context, job_id).json()["job"]["etag"]
+    jobstates = list(job.list_jobstates_iter_models(dci_context, job_id))
+    assert all(js.job_id == job_id for js in jobstates)
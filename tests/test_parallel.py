@@ -0,0 +1,75 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import parallel
+
+import pytest
+import threading
+import time
+
+
+def test_imap_keeps_order():
+    def f(i):
+        time.sleep(0.01 * (5 - i))
+        return i * 2
+
+    assert list(parallel.imap(f, range(5), workers=5)) == [0, 2, 4, 6, 8]
+
+
+def test_run_dag_runs_independent_steps_concurrently():
+    barrier = threading.Barrier(2) if hasattr(threading, "Barrier") else None
+
+    def branch(root):
+        if barrier:
+            barrier.wait(5)
+        return root + 1
+
+    r = parallel.run_dag(
+        {
+            "root": (lambda: 1, []),
+            "left": (branch, ["root"]),
+            "right": (branch, ["root"]),
+            "sum": (lambda left, right: left + right, ["left", "right"]),
+        }
+    )
+    assert r == {"root": 1, "left": 2, "right": 2, "sum": 4}
+
+
+def test_run_dag_errors():
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        parallel.run_dag({"a": (fail, []), "b": (lambda a: a, ["a"])})
+    with pytest.raises(ValueError):
+        parallel.run_dag({"a": (lambda b: b, ["b"]), "b": (lambda a: a, ["a"])})
+    with pytest.raises(ValueError):
+        parallel.run_dag({"a": (lambda c: c, ["c"])})
+
+
+def test_prefetch():
+    produced = []
+
+    def gen():
+        for i in range(3):
+            produced.append(i)
+            yield i
+
+    it = parallel.prefetch(gen())
+    assert next(it) == 0
+    time.sleep(0.1)
+    assert produced == [0, 1]
+    assert list(it) == [1, 2]
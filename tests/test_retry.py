@@ -0,0 +1,115 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import retry
+from tests.shell_commands import utils
+
+import io
+import pytest
+import requests
+
+
+def _context(outcomes):
+    return utils.scripted_context(outcomes, max_retries=5)
+
+
+def test_backoff():
+    policy = retry.RetryPolicy(max_retries=10, jitter=False, max_backoff=4)
+    assert [policy.backoff(i) for i in range(1, 6)] == [0.5, 1, 2, 4, 4]
+    policy.jitter = True
+    assert all(0 <= policy.backoff(3) <= 2 for _ in range(20))
+
+
+def test_retry_after():
+    r = requests.Response()
+    r.headers["Retry-After"] = "3"
+    assert retry.retry_after(r) == 3
+    r.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry.retry_after(r) == 0
+    del r.headers["Retry-After"]
+    assert retry.retry_after(r) is None
+
+
+def test_retry_get():
+    c, adapter = _context([503, 502, 200])
+    r = c.session.get("http://dci/api/v1/jobs")
+    assert r.status_code == 200
+    assert r.retries == 2
+    assert len(c.slept) == 2
+
+
+def test_retry_gives_up():
+    c, adapter = _context([502] * 6)
+    assert c.session.get("http://dci/api/v1/jobs").status_code == 502
+    assert len(adapter.bodies) == 6
+
+    c, adapter = _context([502, 200])
+    c.session.retry_policy.max_retry_time = 0
+    assert c.session.get("http://dci/api/v1/jobs").status_code == 502
+
+
+def test_persistent_500_returned():
+    c, adapter = _context([500] * 80)
+    c.session.retry_policy.max_retries = 80
+    r = c.session.get("http://dci/api/v1/jobs/1")
+    assert r.status_code == 500
+    assert len(adapter.bodies) == 1
+    assert c.slept == []
+
+
+def test_retries_set_on_error():
+    c, adapter = _context([requests.exceptions.ConnectionError("down")] * 6)
+    events = []
+    c.instrumentation.add_post_request_hook(events.append)
+    with pytest.raises(requests.exceptions.ConnectionError) as e:
+        c.session.get("http://dci/api/v1/jobs")
+    assert e.value.retries == 5
+    assert events[0]["retries"] == 5
+
+
+@pytest.mark.parametrize(
+    "outcome,headers,retried",
+    [
+        (502, {}, False),
+        (502, {"Idempotency-Key": "abc"}, True),
+        ((429, {}, {"Retry-After": "2"}), {}, True),
+        (503, {}, True),
+        (requests.exceptions.ConnectTimeout(), {}, True),
+    ],
+)
+def test_retry_post(outcome, headers, retried):
+    c, adapter = _context([outcome, 201])
+    r = c.session.post("http://dci/api/v1/jobs", json={"a": 1}, headers=headers)
+    assert r.status_code == (201 if retried else outcome)
+    assert len(adapter.bodies) == (2 if retried else 1)
+    if isinstance(outcome, tuple):
+        assert c.slept[0] >= 2
+
+
+def test_no_retry_read_timeout_post():
+    c, adapter = _context([requests.exceptions.ReadTimeout(), 201])
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        c.session.post("http://dci/api/v1/jobs", json={})
+
+
+def test_retry_replays_body():
+    c, adapter = _context([503, 201])
+    c.session.post("http://dci/api/v1/files", data=io.BytesIO(b"abc"))
+    assert adapter.bodies == [b"abc", b"abc"]
+
+    c, adapter = _context([503, 201])
+    r = c.session.post("http://dci/api/v1/files", data=(c for c in [b"abc"]))
+    assert r.status_code == 503
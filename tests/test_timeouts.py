@@ -0,0 +1,83 @@
+# -*- encoding: utf-8 -*-
+#
+# Copyright Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from dciclient.v1.api import parallel
+from dciclient.v1.api import timeouts
+from dciclient.v1.exceptions import DeadlineExceeded
+from tests.shell_commands import utils
+
+import pytest
+import requests
+import time
+
+
+def _context(outcomes, max_retries=0):
+    return utils.scripted_context(outcomes, max_retries=max_retries)
+
+
+def test_default_and_overrides():
+    c, adapter = _context([200, 200, 200])
+    c.session.timeouts.overrides["files"] = (5, 3600)
+    c.session.get("http://dci/api/v1/jobs")
+    c.session.post("http://dci/api/v1/files", data=b"x")
+    c.session.get("http://dci/api/v1/jobs", timeout=3)
+    assert adapter.timeouts == [
+        (timeouts.CONNECT_TIMEOUT, timeouts.READ_TIMEOUT),
+        (5, 3600),
+        3,
+    ]
+
+
+def test_deadline_caps_timeouts():
+    policy = timeouts.TimeoutPolicy(connect=10, read=600)
+    with timeouts.deadline(20):
+        connect, read = policy.timeout("jobs")
+        assert connect == 10
+        assert 19 < read <= 20
+        # a nested deadline can't extend the enclosing one
+        with timeouts.deadline(60):
+            assert timeouts.remaining() <= 20
+        assert policy.timeout("jobs", 5) == 5
+    assert timeouts.current_deadline() is None
+    assert policy.timeout("jobs") == (10, 600)
+
+
+def test_deadline_exceeded():
+    c, adapter = _context([200])
+    with timeouts.deadline(at=time.time() - 1):
+        with pytest.raises(DeadlineExceeded):
+            c.session.get("http://dci/api/v1/jobs")
+    assert adapter.timeouts == []
+    assert issubclass(DeadlineExceeded, requests.exceptions.Timeout)
+
+
+def test_deadline_stops_retries():
+    c, adapter = _context([503, 503, 200], max_retries=5)
+    c.session.retry_policy.backoff_factor = 10
+    c.session.retry_policy.jitter = False
+    with timeouts.deadline(5):
+        r = c.session.get("http://dci/api/v1/jobs")
+    assert r.status_code == 503
+    assert len(adapter.timeouts) == 1
+
+
+def test_deadline_propagated_to_workers():
+    with timeouts.deadline(30) as at:
+        results = list(parallel.imap(lambda _: timeouts.current_deadline(), [1, 2]))
+        dag = parallel.run_dag({"a": (timeouts.current_deadline, [])})
+    assert results == [at, at]
+    assert dag["a"] == at
+    assert list(parallel.imap(lambda _: timeouts.current_deadline(), [1])) == [None]